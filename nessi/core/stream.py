@@ -17,7 +17,7 @@ import os
 import sys
 import copy
 import numpy as np
-from scipy.signal import resample
+import scipy.fft
 
 # Import signal processing methods from the nessi.signal module
 import nessi.signal
@@ -27,6 +27,73 @@ import nessi.misc
 from nessi.signal import lsrcinv
 from nessi.misc import csrcest
 
+# This data type follows the Seismic Unix CWP (revision 0)
+# binary header structure. The full 240 bytes layout is kept in memory so
+# that any keyword can be set by the user and headers read from SU files are
+# written back unchanged.
+_SUDTYPE = np.dtype([
+    ('tracl', np.int32), ('tracr', np.int32), ('fldr', np.int32), \
+    ('tracf', np.int32), ('ep', np.int32), ('cdp', np.int32), \
+    ('cdpt', np.int32), ('trid', np.int16), ('nvs', np.int16), \
+    ('nhs', np.int16), ('duse', np.int16), ('offset', np.int32), \
+    ('gelev', np.int32), ('selev', np.int32), ('sdepth', np.int32), \
+    ('gdel', np.int32), ('sdel', np.int32), ('swdep', np.int32), \
+    ('gwdep', np.int32), ('scalel', np.int16), ('scalco', np.int16), \
+    ('sx', np.int32), ('sy', np.int32), ('gx', np.int32), \
+    ('gy', np.int32), ('counit', np.int16), ('wevel', np.int16), \
+    ('swevel', np.int16), ('sut', np.int16), ('gut', np.int16), \
+    ('sstat', np.int16), ('gstat', np.int16), ('tstat', np.int16), \
+    ('laga', np.int16), ('lagb', np.int16), ('delrt', np.int16), \
+    ('muts', np.int16), ('mute', np.int16), ('ns', np.uint16), \
+    ('dt', np.uint16), ('gain', np.int16), ('igc', np.int16), \
+    ('igi', np.int16), ('corr', np.int16), ('sfs', np.int16), \
+    ('sfe', np.int16), ('slen', np.int16), ('styp', np.int16), \
+    ('stas', np.int16), ('stae', np.int16), ('tatyp', np.int16), \
+    ('afilf', np.int16), ('afils', np.int16), ('nofilf', np.int16), \
+    ('nofils', np.int16), ('lcf', np.int16), ('hcf', np.int16), \
+    ('lcs', np.int16), ('hcs', np.int16), ('year', np.int16), \
+    ('day', np.int16), ('hour', np.int16), ('minute', np.int16), \
+    ('sec', np.int16), ('timebas', np.int16), ('trwf', np.int16), \
+    ('grnors', np.int16), ('grnofr', np.int16), ('grnlof', np.int16), \
+    ('gaps', np.int16), ('otrav', np.int16), ('d1', np.float32),\
+    ('f1', np.float32), ('d2', np.float32), ('f2', np.float32), \
+    ('ungpow', np.float32), ('unscale', np.float32), ('ntr', np.int32), \
+    ('mark', np.int16), ('shortpad', np.int16), \
+    ('unassignedInt1', np.int32), ('unassignedInt2', np.int32), \
+    ('unassignedInt3', np.int32), ('unassignedInt4', np.int32), \
+    ('unassignedFloat1', np.float32), ('unassignedFloat2', np.float32), \
+    ('unassignedFloat3', np.float32)])
+
+def _scale(values, scale):
+    """
+    Apply a SU scaling factor (``scalco`` or ``scalel``) to header values.
+    A negative factor is used as divisor, a positive factor as multiplier and
+    a null factor is ignored.
+
+    :param values: header values to scale
+    :param scale: scaling factor associated to each value
+    """
+
+    values = values.astype(np.float32)
+    scale = scale.astype(np.float32)
+
+    values[scale > 0] *= scale[scale > 0]
+    values[scale < 0] /= -scale[scale < 0]
+
+    return values
+
+def _fftaxis(n, d):
+    """
+    Number of positive frequencies and frequency sampling of the real Fourier
+    transform of n samples with a sampling d (the values np.fft.rfftfreq
+    would give without building the vector).
+
+    :param n: number of samples
+    :param d: sampling
+    """
+
+    return n//2+1, 1.0/(n*d)
+
 class Stream():
     """
     Class to handle seismic dataset. The data structure use a classic
@@ -48,41 +115,6 @@ class Stream():
         if needed.
         """
 
-        # This data type follows the Seismic Unix CWP (revision 0)
-        # binary header structure.
-        sudtype = np.dtype([
-            ('tracl', np.int32), ('tracr', np.int32), ('fldr', np.int32), \
-            ('tracf', np.int32), ('ep', np.int32), ('cdp', np.int32), \
-            ('cdpt', np.int32), ('trid', np.int16), ('nvs', np.int16), \
-            ('nhs', np.int16), ('duse', np.int16), ('offset', np.int32), \
-            ('gelev', np.int32), ('selev', np.int32), ('sdepth', np.int32), \
-            ('gdel', np.int32), ('sdel', np.int32), ('swdep', np.int32), \
-            ('gwdep', np.int32), ('scalel', np.int16), ('scalco', np.int16), \
-            ('sx', np.int32), ('sy', np.int32), ('gx', np.int32), \
-            ('gy', np.int32), ('counit', np.int16), ('wevel', np.int16), \
-            ('swevel', np.int16), ('sut', np.int16), ('gut', np.int16), \
-            ('sstat', np.int16), ('gstat', np.int16), ('tstat', np.int16), \
-            ('laga', np.int16), ('lagb', np.int16), ('delrt', np.int16), \
-            ('muts', np.int16), ('mute', np.int16), ('ns', np.uint16), \
-            ('dt', np.uint16), ('gain', np.int16), ('igc', np.int16), \
-            ('igi', np.int16), ('corr', np.int16), ('sfs', np.int16), \
-            ('sfe', np.int16), ('slen', np.int16), ('styp', np.int16), \
-            ('stas', np.int16), ('stae', np.int16), ('tatyp', np.int16), \
-            ('afilf', np.int16), ('afils', np.int16), ('nofilf', np.int16), \
-            ('nofils', np.int16), ('lcf', np.int16), ('hcf', np.int16), \
-            ('lcs', np.int16), ('hcs', np.int16), ('year', np.int16), \
-            ('day', np.int16), ('hour', np.int16), ('minute', np.int16), \
-            ('sec', np.int16), ('timebas', np.int16), ('trwf', np.int16), \
-            ('grnors', np.int16), ('grnofr', np.int16), ('grnlof', np.int16), \
-            ('gaps', np.int16), ('otrav', np.int16), ('d1', np.float32),\
-            ('f1', np.float32), ('d2', np.float32), ('f2', np.float32), \
-            ('ungpow', np.float32), ('unscale', np.float32), ('ntr', np.int32), \
-            ('mark', np.int16), ('shortpad', np.int16), \
-            ('unassignedInt1', np.int32), ('unassignedInt2', np.int32), \
-            ('unassignedInt3', np.int32), ('unassignedInt4', np.int32), \
-            ('unassignedFloat1', np.float32), ('unassignedFloat2', np.float32), \
-            ('unassignedFloat3', np.float32)])
-
         # Orignal file
         # - origin: orignal path to the file
         # - format: original format (i.e., SU, SEG2)
@@ -103,7 +135,7 @@ class Stream():
         # - header: numpy array following the SU/CWP binary header structure
         # - traces: numpy array (1D or 2D) containing the data
         # - datatype: data type (i.e. float, double)
-        self.header = np.zeros(1, dtype=sudtype, order='C')
+        self.header = np.zeros(1, dtype=_SUDTYPE, order='C')
         self.traces = np.zeros(1, dtype=np.float32, order='C')
         self.datatype = np.float32
         self.units0 = 'seconds'
@@ -149,6 +181,12 @@ class Stream():
 
         Trace dependant keyword values can be set afterward.
 
+        If ``data`` is already a C-contiguous ``float32`` array, it is not
+        copied: ``Stream.traces`` shares its memory and in-place processing
+        of the Stream modifies ``data``. Pass ``data.copy()`` to keep the
+        original array untouched. Other arrays are converted (and copied)
+        once.
+
         :param data: numpy array containing the data.
         :param trid: trace identification (default 1, seismic data)
         :param dt: time sampling if trid=1 (default=0.01 s)
@@ -174,24 +212,24 @@ class Stream():
 
         """
 
-        # Get data array size and resize the stream objects header and traces
+        # Get data array size
         # If data array is one dimensional
         if np.ndim(data) == 1:
             # Get the number of samples
             n1 = len(data)
+            n2 = 1
             nd = 1
-            # Resize header and traces arrays
-            self.header.resize(1)
-            self.traces.resize(n1)
         # If data array is two dimensional
         if np.ndim(data) == 2:
             # Get the number of samples in each dimension
             n2 = np.size(data, axis=0) # it corresponds to the number of traces
             n1 = np.size(data, axis=1)
             nd = 2
-            # Resize header and traces arrays
-            self.header.resize(n2)
-            self.traces.resize(n2, n1)
+
+        # Allocate the header and fill traces (no copy if data is already a
+        # C-contiguous float32 array)
+        self.header = np.zeros(n2, dtype=_SUDTYPE, order='C')
+        self.traces = np.asarray(data, dtype=np.float32, order='C')
 
         # Get trace identification code
         trid = options.get('trid', 1)
@@ -203,31 +241,25 @@ class Stream():
             self.header['tracf'] = 1
             self.header['tracr'] = 1
         if nd == 2:
-            for i2 in range(0, n2):
-                self.header[i2]['trid'] = trid
-                self.header[i2]['tracl'] = i2+1
-                self.header[i2]['tracf'] = i2+1
-                self.header[i2]['tracr'] = i2+1
+            itrac = np.arange(1, n2+1, dtype=np.int32)
+            self.header['trid'] = trid
+            self.header['tracl'] = itrac
+            self.header['tracf'] = itrac
+            self.header['tracr'] = itrac
 
         # If trid=1 (seismic data), get the time sampling
         if trid == 1:
             # Get time sampling
             dt = options.get('dt', 0.01)
+            # Time sampling in microseconds (nanoseconds for very small dt)
+            if dt >= 1e-6:
+                dtsu = int(round(dt*1000000.))
+                self.units0 = 'milliseconds'
+            else:
+                dtsu = int(round(dt*1000000.*1000.))
             # Edit header
-            if nd == 1:
-                self.header['ns'] = n1
-                if dt >= 1e-6:
-                    self.header['dt'] = int(np.float32(dt)*np.float32(1000000.))
-                    self.units0 = 'milliseconds'
-                else:
-                    self.header['dt'] = int(np.float32(dt)*np.float32(1000000.)*np.float32(1000.))
-            if nd == 2:
-                self.header[:]['ns'] = n1
-                if dt >= 1e-6:
-                    self.header[:]['dt'] = int(np.float32(dt)*np.float32(1000000.))
-                    self.units0 = 'milliseconds'
-                else:
-                    self.header[:]['dt'] = int(np.float32(dt)*np.float32(1000000.)*np.float32(1000.))
+            self.header['ns'] = n1
+            self.header['dt'] = dtsu
 
         # If trid !=1 (non-seismic data), get the sampling in the first
         # (and 2nd if 2D array) dimensions
@@ -235,23 +267,11 @@ class Stream():
             # Get sampling in the 1st and 2nd dimensions
             d1 = options.get('d1', 1)
             d2 = options.get('d2', 1)
-            # Edit header
-            if nd == 1:
-                self.header['n1'] = n1
-                self.header['n2'] = n2
-                self.header['d1'] = d1
-                self.header['d2'] = d2
-            if nd == 2:
-                self.header[:]['n1'] = n1
-                self.header[:]['n2'] = n2
-                self.header[:]['d1'] = d1
-                self.header[:]['d2'] = d2
-
-        # Fill traces
-        if nd == 1:
-            self.traces[:] = data[:]
-        if nd == 2:
-            self.traces[:, :] = data[:, :]
+            # Edit header (n1 is stored in ns and n2 in ntr)
+            self.header['ns'] = n1
+            self.header['ntr'] = n2
+            self.header['d1'] = d1
+            self.header['d2'] = d2
 
     def gethdr(self, **options):
         """
@@ -290,46 +310,36 @@ class Stream():
         imin = options.get('imin', None)
         count = options.get('count', 1)
 
-        # Get header values
-        ntraces = len(self.header)
-        values = np.zeros(ntraces)
-        values[:] = self.header[:][key]
-
         # Special case 'dt'
         if key == 'dt':
-            values = np.float32(self.header[:][key])/1000000.
+            values = np.float32(self.header[key])/1000000.
 
         # Special case coordinates
-        if(key == 'sx' or key == 'sy' or key == 'gx' or key == 'gy'):
-            for itrace in range(0, ntraces):
-                # Get the scaling factor
-                scalco = self.header[itrace]['scalco']
-                # Apply scaling factor
-                if scalco < 0:
-                    values[itrace] = np.float32(self.header[itrace][key])/np.float32(np.abs(scalco))
-                if scalco > 0:
-                    values[itrace] = np.float32(self.header[itrace][key])*np.float32(np.abs(scalco))
-                if(np.abs(scalco) == 1 or np.abs(scalco) == 0):
-                    values[itrace] == np.float(self.header[itrace][key])
+        elif(key == 'sx' or key == 'sy' or key == 'gx' or key == 'gy'):
+            values = _scale(self.header[key], self.header['scalco'])
 
         # Special case elevation
-        if(key == 'selev' or key == 'gelev'):
-            for itrace in range(0, ntrace):
-                # Get the scaling factor
-                scalel = self.header[itrace]['scalel']
-                # Apply scaling factor
-                if scalel < 0:
-                    values[itrace] = np.float32(self.header[itrace][key])/np.float32(np.abs(scalel))
-                if scalel > 0:
-                    values[itrace] = np.float32(self.header[itrace][key])*np.float32(np.abs(scalel))
-                if(np.abs(scalel) == 1 or np.abs(scalel) == 0):
-                    values[itrace] == np.float(self.header[itrace][key])
+        elif(key == 'selev' or key == 'gelev'):
+            values = _scale(self.header[key], self.header['scalel'])
+
+        # Get header values (with the header keyword data type)
+        else:
+            values = self.header[key].copy()
 
         if imin == None:
             return values
         else:
             return values[imin:imin+count]
 
+    def _sampling(self):
+        """
+        Return the number of samples, the time sampling (s) and the delay
+        (s) from the first trace header as Python scalars.
+        """
+
+        hdr = self.header[0]
+        return int(hdr['ns']), float(hdr['dt'])/1000000., float(hdr['delrt'])/1000.
+
     def copy(self):
         """
         Return a copy of the Stream object.
@@ -351,7 +361,7 @@ class Stream():
         >>> sdata = Stream()
         >>> sdata.create(fakedata, dt=dt)
         >>> # Create a copy of the stream object
-        >>> sdata_copy == sdata.copy()
+        >>> sdata_copy = sdata.copy()
         >>> # Compare original and copy
         >>> sdata.header[0] == sdata_copy.header[0]
         True
@@ -362,7 +372,32 @@ class Stream():
 
         """
 
-        return copy.deepcopy(self)
+        # Copy all members but traces, then traces
+        new = self._copy_notraces()
+        new.traces = self.traces.copy()
+
+        return new
+
+    def _copy_notraces(self):
+        """
+        Return a copy of the Stream object without the traces member, for
+        methods which replace the traces anyway.
+        """
+
+        # Create an empty Stream object without calling __init__
+        new = Stream.__new__(Stream)
+
+        # Copy members: arrays are copied at once, the other members
+        # (descriptors, history, ...) are small and deep-copied
+        for key, value in self.__dict__.items():
+            if key == 'traces':
+                continue
+            if isinstance(value, np.ndarray):
+                new.__dict__[key] = value.copy()
+            else:
+                new.__dict__[key] = copy.deepcopy(value)
+
+        return new
 
     def write(self, fname, path='.'):
         """
@@ -390,17 +425,18 @@ class Stream():
         # Open file to write
         sufile = open(path+'/'+fname+'.su', 'wb')
 
-        # Get the number of traces
+        # Get the number of traces and the number of samples
         ntrac = len(self.header)
+        ns = np.size(self.traces, axis=-1)
 
-        # If one trace only
-        if ntrac == 1:
-            sufile.write(self.header[:])
-            sufile.write(self.traces[:])
-        else:
-            for itrac in range(0, ntrac):
-                sufile.write(self.header[itrac])
-                sufile.write(self.traces[itrac, :])
+        # Interleave headers and traces in one buffer
+        sudata = np.empty(ntrac, dtype=[('header', self.header.dtype),
+                                        ('trace', np.float32, (ns,))])
+        sudata['header'] = self.header
+        sudata['trace'] = self.traces
+
+        # Write headers and traces at once
+        sudata.tofile(sufile)
 
         # Close file
         sufile.close()
@@ -439,37 +475,20 @@ class Stream():
         """
 
         # Get parameters from header
-        ns = self.header[0]['ns']
-        trid = self.header[0]['trid']
-        dt = self.header[0]['dt']/1000000.
-        delrt = self.header[0]['delrt']/1000.
+        ns, dt, delrt = self._sampling()
 
         # Get parameters from options
         tmin = options.get('tmin', 0.)
         tmax = options.get('tmax', 0.)
 
-        # Get the number of dimensions
-        ndim = np.ndim(self.traces)
-
-        # Get the number of traces
-        if ndim == 1:
-            ntraces = 1
-        if ndim == 2:
-            ntraces = np.size(self.traces, axis=0)
-
-        # Get index values for tmin and tmax
-        itmin = int((tmin-delrt)/dt)
-        itmax = int((tmax-delrt)/dt)
-
-        # Slice data
-        if ndim == 1:
-            self.traces = self.traces[itmin:itmax+1]
-            self.header[0]['ns'] = np.size(self.traces)
-            self.header[0]['delrt'] = int(tmin*1000.)
-        if ndim == 2:
-            self.traces = self.traces[:, itmin:itmax+1]
-            self.header[:]['ns'] = np.size(self.traces, axis=1)
-            self.header[:]['delrt'] = int(tmin*1000.)
+        # Get index values for tmin and tmax (bounded by the trace length)
+        itmin = max(0, int((tmin-delrt)/dt))
+        itmax = min(ns-1, int((tmax-delrt)/dt))
+
+        # Slice data along the time axis (1D or 2D)
+        self.traces = np.ascontiguousarray(self.traces[..., itmin:itmax+1])
+        self.header['ns'] = np.size(self.traces, axis=-1)
+        self.header['delrt'] = int(tmin*1000.)
 
     def windkey(self, **options):
         """
@@ -500,18 +519,20 @@ class Stream():
 
         # Get parameters
         key = options.get('key', 'tracf')
-        vmin = options.get('vmin', np.amin(self.header[:]['tracl']))
-        vmax = options.get('vmax', np.amax(self.header[:]['tracl']))
-
-        # Get the number of dimensions
-        ndim = np.ndim(self.traces)
+        vmin = options.get('vmin', np.amin(self.header['tracl']))
+        vmax = options.get('vmax', np.amax(self.header['tracl']))
 
-        # Get the number of traces
-        ntraces = np.size(self.traces, axis=0)
+        # Get the keyword values
+        keyval = self.header[key]
 
         # Get the index value of vmin and vmax
-        ivmin = np.argmin(np.abs(self.header[:][key]-vmin))
-        ivmax = np.argmin(np.abs(self.header[:][key]-vmax))
+        if np.all(keyval[1:] >= keyval[:-1]):
+            # Sorted keyword values: binary search
+            ivmin = np.searchsorted(keyval, vmin, side='left')
+            ivmax = np.searchsorted(keyval, vmax, side='right')-1
+        else:
+            ivmin = np.argmin(np.abs(keyval-vmin))
+            ivmax = np.argmin(np.abs(keyval-vmax))
 
         # Slice
         self.header = self.header[ivmin:ivmax+1]
@@ -519,8 +540,7 @@ class Stream():
 
         # Update header
         ntraces_new = np.size(self.traces, axis=0)
-        for itrace in range(0, ntraces_new):
-            self.header[itrace]['tracf'] = itrace+1
+        self.header['tracf'] = np.arange(1, ntraces_new+1, dtype=np.int32)
 
     def kill(self, **options):
         """
@@ -552,104 +572,62 @@ class Stream():
         # Get parameters from **options
         key = options.get('key', None)
         a = options.get('a', 1)
-        min = options.get('min', 0)
         count = options.get('count', 1)
 
-        # Get the number of dimensions
-        ndim = np.ndim(self.traces)
-
-        # Get the number of traces
-        if ndim == 1:
-            ntraces = 1
-        if ndim == 2:
-            ntraces = np.size(self.traces, axis=0)
-
         # Get the starting index value
-        if key != None:
-            # Get index of the trace for the given keyword
-            istart = np.argmin(np.abs(self.header[:][key]-a))
+        if 'min' in options or key == None:
+            istart = int(options.get('min', 0))
         else:
-            istrat = min
-
-        # Get the stop index
-        istop = istart+count
+            # Get index of the trace for the given keyword
+            istart = int(np.argmin(np.abs(self.header[key]-a)))
 
-        # Kill traces
-        if ndim == 1:
-            self.traces[:] = 0.
-        if ndim == 2:
-            self.traces[istart:istop,:] = 0.
+        # Kill traces (1D data is seen as a single trace)
+        traces = np.atleast_2d(self.traces)
+        traces[istart:istart+count, :] = 0.
 
     def mute(self, xmute, tmute, key='tracl', ntaper=0, mode=0):
         """
-        Mute above or below a user-defined polygonal lineself.
+        Mute above or below a user-defined polygonal line.
 
-        :param xmute: array of position values
+        :param xmute: array of position values (increasing)
         :param tmute: array of time values
+        :param key: header keyword associated to xmute (default 'tracl')
         :param ntaper: number of points to taper before hard mute
         :param mode: mute above (0) or mute below(1)
 
         """
 
         # Get values from header
-        ns = self.header[0]['ns']
-        dt = self.header[0]['dt']/1000000.
-        delrt = self.header[0]['delrt']/1000.
-        ntrac = len(self.header)
-
-        # Get the number of points
-        npts = len(xmute)
+        ns, dt, delrt = self._sampling()
 
         # Get the keyword values
-        keyval = self.header[:][key]
-
-        # Get trace number for each point
-        keytracn = np.zeros(npts, dtype=np.int)
-        for ipts in range(0, npts):
-            keytracn[ipts] = np.argmin(np.abs(xmute[ipts]-keyval[:]))
-
-        # Build the sine squared taper
-        taper = np.zeros(ntaper, dtype=np.float32)
-        for itaper in range(0, ntaper):
-            ftap = np.sin(float(itaper+1)*np.pi/(float(2*ntaper)))
-            taper[itaper] = ftap**2
-
-        # Build the polygonal line
-        polyline = np.zeros(ntrac, dtype=np.int)
-        ## First point
-        if keytracn[0] > 0:
-            polyline[:keytracn[0]] = int((tmute[0]-delrt)/dt)
-        ## Last point
-        if keytracn[-1] < ntrac:
-            polyline[keytracn[-1]:] = int((tmute[-1]-delrt)/dt)
-        ## Middle points
-        for ipts in range(1, npts):
-            slope = (tmute[ipts]-tmute[ipts-1])/(xmute[ipts]-xmute[ipts-1])
-            origin = tmute[ipts-1]
-            i = 0
-            for itrac in range(keytracn[ipts-1], keytracn[ipts]):
-                polyline[itrac] = int((slope*float(i)+tmute[ipts-1]-delrt)/dt)
-                i += 1
+        keyval = self.header[key].astype(np.float64)
 
-        # Mute
+        # Build the sine squared taper (a one point taper is a hard mute)
+        ntaper = max(ntaper, 1)
+        taper = np.sin(np.arange(1, ntaper+1)*np.pi/float(2*ntaper))**2
+
+        # Build the polygonal line: mute time of each trace interpolated
+        # between points (constant before the first and after the last point)
+        tpoly = np.interp(keyval, xmute, tmute)
+        polyline = ((tpoly-delrt)/dt).astype(np.int32)
+
+        # Distance (in samples) from the polygonal line toward the muted area
+        isamp = np.arange(0, ns)
         if mode == 0: # Mute above
-            for itrac in range(0, ntrac):
-                imute = polyline[itrac]
-                # Apply taper
-                for j in range(0, ntaper):
-                    if imute-j >= 0:
-                        self.trace[itrac, imute-j] *= taper[ntaper-j-1]
-                if imute-ntaper >= 0:
-                    self.trace[itrac,:imute-ntaper] = 0.
+            dist = polyline[:, np.newaxis]-isamp
         if mode == 1: # Mute below
-            for itrac in range(0, ntrac):
-                imute = polyline[itrac]
-                # Apply taper
-                for j in range(0, ntaper):
-                    if imute+j < ns:
-                        self.trace[itrac, imute+j] *= taper[j]
-                if imute+ntaper < ns:
-                    self.trace[itrac,imute+ntaper:] = 0.
+            dist = isamp-polyline[:, np.newaxis]
+
+        # Weights as a function of the distance: 1 outside the muted area,
+        # sine squared taper over ntaper points and 0 beyond.
+        weight = np.zeros(ntaper+2, dtype=np.float32)
+        weight[0] = 1.
+        weight[1:ntaper+1] = taper[::-1]
+
+        # Mute
+        traces = np.atleast_2d(self.traces)
+        traces *= weight[np.clip(dist, -1, ntaper)+1]
 
 
     # --------------------------------------------------
@@ -693,10 +671,9 @@ class Stream():
         weight = options.get('weight', np.ones(ntrac, dtype=self.datatype))
         mean = options.get('mean', False)
 
-        # Stacking traces
-        stacktrac = np.zeros(ns, dtype=np.float32)
-        for itrac in range(0, ntrac):
-            stacktrac[:] += self.traces[itrac,:]*weight[itrac]
+        # Stacking traces (weighted sum over the trace axis)
+        weight = np.asarray(weight, dtype=np.float32)
+        stacktrac = np.dot(weight, np.ascontiguousarray(self.traces, dtype=np.float32))
 
         # Mean
         if mean == True:
@@ -709,8 +686,7 @@ class Stream():
         self.header[0]['tracf'] = 1
 
         # Update traces
-        self.traces.resize(1, ns)
-        self.traces = stacktrac[:]
+        self.traces = stacktrac
 
     # --------------------------------------------------
     # >> TAPERING
@@ -745,7 +721,7 @@ class Stream():
         """
 
         # Get parameters from header
-        dt = self.header[0]['dt']/1000000.
+        ns, dt, delrt = self._sampling()
 
         # Tapering data
         self.traces = nessi.signal.time_taper(self.traces, dt=dt, **options)
@@ -783,7 +759,7 @@ class Stream():
         >>> sdata.pfilter(freq=[40., 50., 200., 250.], amps=[0., 1., 1., 0.])
 
         """
-        dt = self.header[0]['dt']/1000000.
+        ns, dt, delrt = self._sampling()
         self.traces = nessi.signal.sin2filter(self.traces, dt, freq, amps)
 
     def normalize(self, **options):
@@ -821,11 +797,10 @@ class Stream():
                 ampmax = np.amax(np.abs(self.traces[:, :]))
                 self.traces[:, :] /= ampmax
             if mode == 'trace':
-                ntrac = np.size(self.traces, axis=0)
-                # Loop over traces
-                for itrac in range(0, ntrac):
-                    ampmax = np.amax(np.abs(self.traces[itrac, :]))
-                    self.traces[itrac, :] /= ampmax
+                # Maximum amplitude of each trace (null traces are unchanged)
+                ampmax = np.maximum(np.amax(self.traces, axis=1), -np.amin(self.traces, axis=1))
+                ampmax[ampmax == 0.] = 1.
+                self.traces /= ampmax[:, np.newaxis]
 
     def resample(self, nso, dto):
         """
@@ -848,8 +823,7 @@ class Stream():
 
         """
         # Get values from header
-        ns = self.header[0]['ns']
-        dt = self.header[0]['dt']/1000000.
+        ns, dt, delrt = self._sampling()
 
         # Calculate time lenght for the old data
         t_old = float(ns-1)*dt
@@ -864,16 +838,25 @@ class Stream():
         if nsamp > ns:
             print('Impossible to resample \n')
         else:
-            if np.ndim(self.traces) == 1:
-                traces = resample(self.traces[:,:nsamp], num=nso)
-                self.traces = traces
-            else:
-                traces = resample(self.traces[:,:nsamp], num=nso, axis=1 )
-                self.traces = np.ascontiguousarray(traces, dtype=self.datatype)
+            # Fourier resampling (same scheme as scipy.signal.resample)
+            # written directly so that the output is C-contiguous float32
+            gtraces = scipy.fft.rfft(self.traces[..., :nsamp], axis=-1, workers=-1)
+            nfreq = min(nso, nsamp)//2+1
+            gresamp = np.zeros(gtraces.shape[:-1]+(nso//2+1,), dtype=gtraces.dtype)
+            gresamp[..., :nfreq] = gtraces[..., :nfreq]
+            # - Nyquist component of an even number of samples
+            if min(nso, nsamp)%2 == 0:
+                if nso < nsamp:
+                    gresamp[..., nfreq-1] *= 2.
+                elif nso > nsamp:
+                    gresamp[..., nfreq-1] *= 0.5
+            self.traces = scipy.fft.irfft(gresamp, n=nso, axis=-1, workers=-1,
+                                          overwrite_x=True)
+            self.traces *= float(nso)/float(nsamp)
 
         # Edit header
-        self.header[:]['ns'] = int(nso)
-        self.header[:]['dt'] = int(dto*1000000.)
+        self.header['ns'] = int(nso)
+        self.header['dt'] = int(dto*1000000.)
 
     # --------------------------------------------------
     # >> OPERATIONS
@@ -907,32 +890,25 @@ class Stream():
 
     def specfx(self):
         """
-        Fourier spectrum (time to frequency) of traces using the numpy.fft functions.
+        Fourier spectrum (time to frequency) of traces using the scipy.fft functions.
         """
 
-        # Get number of time samples and numner of traces
-        if np.ndim(self.traces) == 1:
-            fftaxis = 0
-        else:
-            fftaxis = 1
+        # Amplitude of the real Fourier transform (along the time axis)
+        self.traces = np.absolute(scipy.fft.rfft(self.traces, axis=-1, workers=-1))
 
-        # Amplitude of the real Fourier transform
-        self.traces = np.absolute(np.fft.rfft(self.traces, axis=1)) #fftaxis))
-
-        # Get the frequency vector
-        ns = self.header[0]['ns']
-        dt = self.header[0]['dt']/1000000.
-        frqv = np.fft.rfftfreq(ns, dt)
+        # Get the frequency axis
+        ns, dt, delrt = self._sampling()
+        nfreq, dfreq = _fftaxis(ns, dt)
 
         # Update the SU header
-        self.header[:]['ns'] = len(frqv)
-        self.header[:]['d1'] = frqv[1]-frqv[0]
-        self.header[:]['dt'] = 0
-        self.header[:]['trid'] = 118 # Amplitude of complex trace from 0 to Nyquist
+        self.header['ns'] = nfreq
+        self.header['d1'] = dfreq
+        self.header['dt'] = 0
+        self.header['trid'] = 118 # Amplitude of complex trace from 0 to Nyquist
 
     def specfk(self):
         """
-        FK spectrum of traces using the numpy.fft functions.
+        FK spectrum of traces using the scipy.fft functions.
         """
 
         # Get dx from header, if not set dx=1.0
@@ -941,28 +917,27 @@ class Stream():
             d2 = 1.0
         ntrac = len(self.header)
 
-        # Amplitude of the real Fourier transform
-        self.traces = np.fft.rfft(self.traces, axis=1)
-        self.traces = np.fft.fft(self.traces, axis=0)
-        self.traces = np.flip(np.fft.fftshift(self.traces, axes=0), axis=0)
-        self.traces = np.absolute(self.traces)
+        # Amplitude of the 2D real Fourier transform (real transform along
+        # time, complex transform along traces handled in the same call)
+        self.traces = np.absolute(scipy.fft.rfft2(self.traces, axes=(0, 1), workers=-1))
+        # Centering and flipping of the K axis in a single gather
+        # (same ordering as np.flip(np.fft.fftshift(..., axes=0), axis=0))
+        ikflip = (ntrac-1-ntrac//2-np.arange(ntrac))%ntrac
+        self.traces = self.traces[ikflip]
 
-        # Get the frequency and K vectors
-        ns = self.header[0]['ns']
-        dt = self.header[0]['dt']/1000000.
-        frqv = np.fft.rfftfreq(ns, dt)
-        wavv = np.fft.fftfreq(ntrac, d2)
-        # Centering
-        wavv = np.fft.fftshift(wavv)
+        # Get the frequency and K axes (the K axis is centered)
+        ns, dt, delrt = self._sampling()
+        nfreq, dfreq = _fftaxis(ns, dt)
+        dwav = _fftaxis(ntrac, d2)[1]
 
         # Update the SU header
-        self.header[:]['ns'] = len(frqv)
-        self.header[:]['d1'] = frqv[1]-frqv[0]
-        self.header[:]['d2'] = np.abs(wavv[1]-wavv[0])
-        self.header[:]['dt'] = 0
-        self.header[:]['f1'] = frqv[0] #frqv[1]-frqv[0]
-        self.header[:]['f2'] = wavv[0]
-        self.header[:]['trid'] = 122 # Amplitude of complex trace from 0 to Nyquist
+        self.header['ns'] = nfreq
+        self.header['d1'] = dfreq
+        self.header['d2'] = dwav
+        self.header['dt'] = 0
+        self.header['f1'] = 0.
+        self.header['f2'] = -(ntrac//2)*dwav
+        self.header['trid'] = 122 # Amplitude of complex trace from 0 to Nyquist
 
     def masw(self, **options):
         """
@@ -998,33 +973,15 @@ class Stream():
         else:
             inorm = 0
 
-        # Get scaling factor on coordinates from header
-        scalco = self.header[0]['scalco']
-        if scalco < 0:
-            scale_coordinates = -1./float(scalco)
-        if scalco == 0:
-            scale_coordinates = 1.
-        if scalco > 0:
-            scale_coordinates = float(scalco)
-
-        # Get (X, Y) coordinates
-        x = self.header[:]['sx']*scale_coordinates-self.header[:]['gx']*scale_coordinates
-        y = self.header[:]['sy']*scale_coordinates-self.header[:]['gy']*scale_coordinates
-
-        # Get Z coordinates
-        z = np.zeros(len(x), dtype=np.float32)
-        for irec in range(0, len(x)):
-            scalel = self.header[irec]['scalel']
-            if scalel < 0:
-                scale_elevation = -1./float(scalel)
-            if scalel == 0:
-                scale_elevation = 1.
-            if scalel > 0:
-                scale_elevation = float(scalel)
-        z = self.header[:]['selev']*scale_elevation-self.header[:]['gelev']*scale_elevation
-
-        # Calculate offsets
-        offset = np.float32(np.sqrt(x**2+y**2+z**2))
+        # Get (X, Y) coordinates scaled trace by trace
+        x = _scale(self.header['sx'], self.header['scalco'])-_scale(self.header['gx'], self.header['scalco'])
+        y = _scale(self.header['sy'], self.header['scalco'])-_scale(self.header['gy'], self.header['scalco'])
+
+        # Get Z coordinates scaled trace by trace
+        z = _scale(self.header['selev'], self.header['scalel'])-_scale(self.header['gelev'], self.header['scalel'])
+
+        # Calculate offsets (x, y and z are already float32)
+        offset = np.hypot(np.hypot(x, y), z)
 
         if self.units1 == 'millimeters':
             offset *=1000.
@@ -1034,15 +991,17 @@ class Stream():
         vel = np.linspace(vmin, vmax, nv, dtype=self.datatype)
 
         # Get the number of samples and the time sampling from header
-        ns = int(self.header[0]['ns'])
-        dt = self.header[0]['dt']/1000000.
+        ns, dt, delrt = self._sampling()
+
+        # Check the frequency band against the Nyquist frequency
+        if fmin < 0. or fmax > 0.5/dt:
+            raise ValueError('frequency band out of [0, Nyquist]')
 
         # Apply Real Fourier transform to data
-        gobs = np.complex64(np.fft.rfft(self.traces, axis=1))
+        gobs = np.asarray(scipy.fft.rfft(self.traces, axis=1, workers=-1), dtype=np.complex64)
 
-        # Get the corresponding frequency vector
-        freq = np.float32(np.fft.rfftfreq(ns, d=dt))
-        dw = freq[1]
+        # Get the corresponding frequency sampling
+        dw = np.float32(_fftaxis(ns, dt)[1])
         iwmin = int(fmin/dw)
         nw = int((fmax-fmin)/dw)+1
         freq = np.linspace(fmin, fmax, nw, dtype=self.datatype)
@@ -1055,13 +1014,13 @@ class Stream():
         self.traces = np.zeros((nv, nw), dtype=np.float32)
 
         # Update SU header
-        self.header[:]['ns'] = nw #len(freq[iwmin:iwmin+nw])
-        self.header[:]['d1'] = dw
-        self.header[:]['d2'] = np.abs(vel[1]-vel[0])
-        self.header[:]['dt'] = 0
-        self.header[:]['f1'] = freq[iwmin]
-        self.header[:]['f2'] = vel[0]
-        self.header[:]['trid'] = 132 # Like 122 but for MASW
+        self.header['ns'] = nw #len(freq[iwmin:iwmin+nw])
+        self.header['d1'] = dw
+        self.header['d2'] = np.abs(vel[1]-vel[0])
+        self.header['dt'] = 0
+        self.header['f1'] = freq[iwmin]
+        self.header['f2'] = vel[0]
+        self.header['trid'] = 132 # Like 122 but for MASW
         self.traces[:, :] = disp[:, :]
 
     def dispick(self, vpbeg=300., wpbeg=30., deltav=20.):
@@ -1154,16 +1113,10 @@ def susrcinv(dcal, scal, dobs):
     ns = dcal.header['ns'][0]
     dt = dcal.header['dt'][0]/1000000.
 
-    # Get the number of traces
-    if dobs.traces.ndim == 1:
-        ntrac = 1
-        naxis = 0
-    if dobs.traces.ndim == 2:
-        ntrac = np.size(dobs.traces, axis=0)
-        naxis = 1
-
-    # Linear source inversion
-    srcest, corrector = lsrcinv(dcal.traces, scal.traces[:], dobs.traces, axis=naxis)
+    # Linear source inversion (traces always passed as 2D arrays with
+    # time along the second axis)
+    srcest, corrector = lsrcinv(np.atleast_2d(dcal.traces), scal.traces,
+                                np.atleast_2d(dobs.traces), axis=1)
     #srcest, corrector = csrcest(dcal.traces, scal.traces[:], dobs.traces)
     #srcest, corrector = lsrcinv2d(dcal.traces, scal.traces, dobs.traces)
 
@@ -1179,36 +1132,19 @@ def susrccorr(object, corrector):
     """
 
     # Get parameters
-    ns = object.header[0]['ns']
-    dt = object.header[0]['dt']/1000000.
-    nw = len(corrector)
-
-    # Get dimensions
-    if np.ndim(object.traces) == 1:
-        axis = 0
-        ntrac = 1
-    else:
-        axis = 1
-        ntrac = len(object.traces)
-
-    # Copy original data
-    data_corrected = copy.deepcopy(object)
-
-    # Apply corrector
-    if ntrac == 1:
-        # Fast Fourier transform
-        gtraces = np.fft.rfft(object.traces, axis=0)
-        # Correction
-        gtraces[:] *= np.conj(corrector[:])
-        # Inverse Foureir transform
-        data_corrected.traces = np.fft.irfft(gtraces, axis=0, n=ns)
-    else:
-        # Fast Fourier transform
-        gtraces = np.fft.rfft(object.traces, axis=1)
-        # Correction
-        for itrac in range(0, ntrac):
-            gtraces[itrac, :] *= np.conj(corrector[:])
-        # Inverse Fourier transform
-        data_corrected.traces = np.fft.irfft(gtraces, axis=1, n=ns)
+    ns = int(object.header[0]['ns'])
+
+    # Copy original data (traces are replaced below)
+    data_corrected = object._copy_notraces()
+
+    # Apply corrector along the time axis (broadcast over traces)
+    # - Fast Fourier transform
+    gtraces = scipy.fft.rfft(object.traces, axis=-1, workers=-1)
+    # - Correction
+    gtraces *= np.conj(corrector)
+    # - Inverse Fourier transform (ascontiguousarray only copies if the
+    #   output of irfft is not already C-contiguous)
+    traces = scipy.fft.irfft(gtraces, axis=-1, n=ns, workers=-1, overwrite_x=True)
+    data_corrected.traces = np.ascontiguousarray(traces)
 
     return data_corrected
@@ -17,8 +17,12 @@ Test suite for the main methods of the Stream class.
     (https://www.gnu.org/copyleft/lesser.html)
 """
 
+import tempfile
 import numpy as np
+import pytest
+import nessi.signal
 from nessi.core import Stream
+from nessi.io import suread
 
 # List of test functions
 # - test_streal_create_1d()
@@ -26,7 +30,10 @@ from nessi.core import Stream
 # - test_stream_gethdr_1d()
 # - test_stream_gethdr_2d()
 # - test_stream_gethdr_count_2d()
+# - test_stream_gethdr_scalco_2d()
 # - test_stream_copy()
+# - test_stream_write_2d()
+# - test_stream_masw_band()
 
 def test_stream_create_1d():
     """
@@ -149,6 +156,35 @@ def test_stream_gethdr_count_2d():
 
     np.testing.assert_equal(sx, sx_att)
 
+def test_stream_gethdr_scalco_2d():
+    """
+    Test the Stream.gethdr method for scaled coordinates and elevations.
+    """
+
+    # Create two-dimensionnal data of size 'ns'x'nr'
+    ns = 256
+    nr = 3
+    data = np.ones((nr, ns))
+
+    # Create a new Stream object
+    object = Stream()
+
+    # Create SU-like data structure from 'data' without options.
+    object.create(data, dt=0.01)
+
+    # Set header values (divisor, multiplier and no scaling)
+    object.header['gx'] = 150
+    object.header['scalco'] = [-100, 10, 0]
+    object.header['gelev'] = 25
+    object.header['scalel'] = [-10, 0, 2]
+
+    # Get header values
+    gx = object.gethdr(key='gx')
+    gelev = object.gethdr(key='gelev')
+
+    np.testing.assert_allclose(gx, [1.5, 1500., 150.])
+    np.testing.assert_allclose(gelev, [2.5, 25., 50.])
+
 def test_stream_copy():
     """
     Test the Stream.copy method.
@@ -170,5 +206,65 @@ def test_stream_copy():
     np.testing.assert_equal(object1.header, object2.header)
     np.testing.assert_equal(object1.traces, object2.traces)
 
-if __name__ == "__main__" :
-    np.testing.run_module_suite()
+def test_stream_write_2d():
+    """
+    Test the Stream.write method for 2D data.
+    """
+
+    # Create two-dimensionnal data of size 'ns'x'nr'
+    ns = 256
+    nr = 64
+    data = np.random.rand(nr, ns).astype(np.float32)
+
+    # Create a new Stream object
+    object = Stream()
+
+    # Create SU-like data structure from 'data'.
+    object.create(data, dt=0.001)
+    object.header['gx'] = np.arange(0, nr)
+
+    # Write and read back the SU file
+    with tempfile.TemporaryDirectory() as path:
+        object.write('test_stream_write', path=path)
+        sudata = suread(path+'/test_stream_write.su')
+
+    np.testing.assert_equal(sudata.header, object.header)
+    np.testing.assert_equal(sudata.traces, object.traces)
+
+def test_stream_masw_band():
+    """
+    Test that Stream.masw and cymasw reject a frequency band out of the
+    data spectrum.
+    """
+
+    # Create two-dimensionnal data of size 'ns'x'nr'
+    ns = 256
+    nr = 8
+    dt = 0.001
+    data = np.random.rand(nr, ns).astype(np.float32)
+
+    # Create a new Stream object with receivers every meter
+    object = Stream()
+    object.create(data, dt=dt)
+    object.header['gx'] = np.arange(1, nr+1)
+
+    # Frequency band above the Nyquist frequency
+    with pytest.raises(ValueError):
+        object.masw(vmin=100., vmax=1000., dv=100., fmin=10., fmax=1000.)
+
+    # Frequency band up to the Nyquist frequency
+    object.masw(vmin=100., vmax=1000., dv=100., fmin=10., fmax=500.)
+    np.testing.assert_equal(object.traces.shape, (10, object.header[0]['ns']))
+
+    # Frequency band out of the spectrum passed to the kernel
+    gtraces = np.ones((4, 10), dtype=np.complex64)
+    offset = np.ones(4, dtype=np.float32)
+    vel = np.linspace(100., 200., 3, dtype=np.float32)
+    with pytest.raises(ValueError):
+        nessi.signal.cymasw(gtraces, offset, vel,
+                            np.linspace(1., 2., 200000, dtype=np.float32),
+                            5, 0, 0)
+    with pytest.raises(ValueError):
+        nessi.signal.cymasw(gtraces, offset[:3], vel,
+                            np.linspace(1., 2., 5, dtype=np.float32),
+                            5, 0, 0)
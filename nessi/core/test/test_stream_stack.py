@@ -112,6 +112,3 @@ def test_stream_stack_weight_2d():
     np.testing.assert_equal(np.size(object.header, axis=0), 1)
     np.testing.assert_equal(object.header[0]['ns'], ns)
     np.testing.assert_equal(object.traces, dstack)
-
-if __name__ == "__main__" :
-    np.testing.run_module_suite()
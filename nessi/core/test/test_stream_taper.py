@@ -180,6 +180,3 @@ def test_taper_cosine_1d():
 
     # Testing
     np.testing.assert_allclose(object.traces, output, atol=1.e-4)
-
-if __name__ == "__main__" :
-    np.testing.run_module_suite()
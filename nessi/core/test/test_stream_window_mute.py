@@ -27,6 +27,8 @@ import matplotlib.pyplot as plt
 # - test_stream_windkey_2d()
 # - test_stream_kill_one_trace_2d()
 # - test_stream_kill_multi_traces_2d()
+# - test_stream_mute_above_2d()
+# - test_stream_mute_below_2d()
 
 def test_stream_wind_1d():
     """
@@ -173,5 +175,60 @@ def test_stream_kill_multi_traces_2d():
     # Testing the stream object members initialization
     np.testing.assert_equal(object.traces[9:19,:], dkill)
 
-if __name__ == "__main__" :
-    np.testing.run_module_suite()
+def test_stream_mute_above_2d():
+    """
+    Test the ``mute`` method of the Stream class for 2D data (mute above).
+    """
+
+    # Create two-dimensionnal data of size '(nr,ns)'
+    nr = 100
+    ns = 1000
+    dt = 0.001
+    data = np.ones((nr, ns), dtype=np.float32)
+
+    # Create a new Stream object
+    object = Stream()
+
+    # Create SU-like data structure from 'data' without options.
+    object.create(data, dt=dt)
+
+    # Muting above t=0.1s with a 10 points taper
+    object.mute([1, nr], [0.1, 0.1], ntaper=10, mode=0)
+
+    # Attempted result
+    taper = np.sin(np.arange(1, 11)*np.pi/20.)**2
+    dmute = np.ones((nr, ns), dtype=np.float32)
+    dmute[:, :91] = 0.
+    dmute[:, 91:101] = taper
+
+    # Testing the muted traces
+    np.testing.assert_allclose(object.traces, dmute, atol=1.e-7)
+
+def test_stream_mute_below_2d():
+    """
+    Test the ``mute`` method of the Stream class for 2D data (mute below).
+    """
+
+    # Create two-dimensionnal data of size '(nr,ns)'
+    nr = 100
+    ns = 1000
+    dt = 0.001
+    data = np.ones((nr, ns), dtype=np.float32)
+
+    # Create a new Stream object
+    object = Stream()
+
+    # Create SU-like data structure from 'data' without options.
+    object.create(data, dt=dt)
+
+    # Muting below t=0.1s with a 10 points taper
+    object.mute([1, nr], [0.1, 0.1], ntaper=10, mode=1)
+
+    # Attempted result
+    taper = np.sin(np.arange(1, 11)*np.pi/20.)**2
+    dmute = np.ones((nr, ns), dtype=np.float32)
+    dmute[:, 100:110] = taper[::-1]
+    dmute[:, 110:] = 0.
+
+    # Testing the muted traces
+    np.testing.assert_allclose(object.traces, dmute, atol=1.e-7)
@@ -241,6 +241,3 @@ def test_init_chromosome():
 
     # Testing
     np.testing.assert_equal(genalg.current[:,:], output)
-
-if __name__ == "__main__" :
-    np.testing.run_module_suite()
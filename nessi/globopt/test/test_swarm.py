@@ -583,6 +583,3 @@ def test_fiupdate_weight_toroidal():
     # Testing update method
     swarm.fiupdate(control=0, topology='toroidal', ndim=3)
     np.testing.assert_equal(swarm.current, output)
-
-if __name__ == "__main__" :
-    np.testing.run_module_suite()
@@ -20,9 +20,10 @@ Pullan, S.E., 1990, Recommanded standard for seismic (/radar) data files in
 """
 
 # Import modules
+import mmap
 import numpy as np
 from nessi.core import Stream
-from struct import unpack
+from struct import unpack, Struct
 
 FILE_DESCRIPTOR = {
     'ACQUISITION_DATE': '',
@@ -79,47 +80,41 @@ TRACE_DESCRIPTOR = {
     'NOTE': '',
 }
 
-SUHEADER = {
-    'tracl': np.int32, 'tracr': np.int32, 'fldr': np.int32,
-    'tracf': np.int32, 'ep': np.int32, 'cdp': np.int32,
-    'cdpt': np.int32, 'trid': np.int16, 'nvs': np.int16,
-    'nhs': np.int16, 'duse': np.int16, 'offset': np.int32,
-    'gelev': np.int32, 'selev': np.int32, 'sdepth': np.int32,
-    'gdel': np.int32, 'sdel': np.int32, 'swdep': np.int32,
-    'gwdep': np.int32, 'scalel': np.int16, 'scalco': np.int16,
-    'sx': np.int32, 'sy': np.int32, 'gx': np.int32,
-    'gy': np.int32, 'counit': np.int16, 'wevel': np.int16,
-    'swevel': np.int16, 'sut': np.int16, 'gut': np.int16,
-    'sstat': np.int16, 'gstat': np.int16, 'tstat': np.int16,
-    'laga': np.int16, 'lagb': np.int16, 'delrt': np.int16,
-    'muts': np.int16, 'mute': np.int16, 'ns': np.uint16,
-    'dt': np.uint16, 'gain': np.int16, 'igc': np.int16,
-    'igi': np.int16, 'corr': np.int16, 'sfs': np.int16,
-    'sfe': np.int16, 'slen': np.int16, 'styp': np.int16,
-    'stas': np.int16, 'stae': np.int16, 'tatyp': np.int16,
-    'afilf': np.int16, 'afils': np.int16, 'nofilf': np.int16,
-    'nofils': np.int16, 'lcf': np.int16, 'hcf': np.int16,
-    'lcs': np.int16, 'hcs': np.int16, 'year': np.int16,
-    'day': np.int16, 'hour': np.int16, 'minute': np.int16,
-    'sec': np.int16, 'timebas': np.int16, 'trwf': np.int16,
-    'grnors': np.int16, 'grnofr': np.int16, 'grnlof': np.int16,
-    'gaps': np.int16, 'otrav': np.int16, 'd1': np.float32,
-    'f1': np.float32, 'd2': np.float32, 'f2': np.float32,
-    'ungpow': np.float32, 'unscale': np.float32, 'ntr': np.int32,
-    'mark': np.int16, 'shortpad': np.int16,
-    'unassignedInt1': np.int32, 'unassignedInt2': np.int32,
-    'unassignedInt3': np.int32, 'unassignedInt4': np.int32,
-    'unassignedFloat1': np.float32, 'unassignedFloat2': np.float32,
-    'unassignedFloat3': np.float32,
+# SEG-2 trace types and corresponding SU trace identification codes (trid)
+TRACE_TYPE = {'UNKNOW': 0, 'SEISMIC_DATA': 1, 'DEAD': 2, 'TEST_DATA': 3, 'UPHOLE': 4}
+
+# SEG-2 units and corresponding SU coordinate units (counit) and Stream units;
+# counit type 6 is specific to IFSTTAR REDUCED-SCALE MODELING
+UNITS = {
+    'FEET': (1, 'feet'), 'METERS': (1, 'meters'),
+    'INCHES': (5, 'inches'), 'CENTIMETERS': (5, 'centimeters'),
+    'MILLIMETERS': (6, 'millimeters'),
 }
 
+# SU header fields filled trace by trace from the trace descriptors
+HEADER_COLUMNS = ('trid', 'ns', 'dt', 'delrt', 'gx', 'gy', 'sx', 'sy',
+                  'gelev', 'selev', 'gdel', 'sdel')
+
+# Sample formats of the data blocks (data code 3, 20-bit floating point, is
+# not supported)
+DATA_CODE = {1: np.int16, 2: np.int32, 4: np.float32, 5: np.float64}
+
+# Precompiled binary formats used by the readers, for each endianess
+# - B: unsigned 8-bit integer
+# - h: signed 16-bit integer
+# - H: unsigned 16-bit integer
+# - L: unsigned 32-bit integer
+# - 2xHLLB: fixed part of the trace descriptor block (block size, data block
+#   size, number of samples and data code after the block identifier)
+STRUCTS = {endian: {fmt: Struct(endian+fmt) for fmt in (b'B', b'h', b'H', b'L', b'2xHLLB')}
+           for endian in (b'<', b'>')}
 
 def _read_file_descriptor(fpointer):
     """
     This function reads and stores informations from the
     `file descriptor block`.
 
-    :param fpointer: pointer containing the file to read
+    :param fpointer: memory map of the file to read
     """
 
     # Read the first sub-block of the descriptor block (32 bytes)
@@ -136,26 +131,31 @@ def _read_file_descriptor(fpointer):
         # Big-endian
         endian = b'>'
 
+    # Get binary formats for this endianess
+    uint8 = STRUCTS[endian][b'B']
+    int16 = STRUCTS[endian][b'h']
+    uint16 = STRUCTS[endian][b'H']
+
     # Get the revision ID
-    revision_id = unpack(endian+b'H', descriptor_subblock[2:4])[0]
+    revision_id = uint16.unpack_from(descriptor_subblock, 2)[0]
 
     # Get the size of the trace pointer sub-block (M)
-    trace_pointer_subblock_size = unpack(endian+b'H', descriptor_subblock[4:6])[0]
+    trace_pointer_subblock_size = uint16.unpack_from(descriptor_subblock, 4)[0]
 
     # Get the number of traces in file (N)
-    number_of_traces = unpack(endian+b'H', descriptor_subblock[6:8])[0]
+    number_of_traces = uint16.unpack_from(descriptor_subblock, 6)[0]
 
     # Get string terminator size and character
-    string_term_size = unpack(endian+b'B', descriptor_subblock[8:9])[0]
-    string_term_char = unpack(endian+b'c', descriptor_subblock[9:10])[0]
+    string_term_size = uint8.unpack_from(descriptor_subblock, 8)[0]
+    string_term_char = descriptor_subblock[9:10]
     if string_term_size == 2:
-        string_term_char += unpack(endian+b'c', descriptor_subblock[10:11])[0]
+        string_term_char = descriptor_subblock[9:11]
 
     # Get line terminator size and character
-    line_term_size = unpack(endian+b'B', descriptor_subblock[11:12])[0]
-    line_term_char = unpack(endian+b'c', descriptor_subblock[12:13])[0]
+    line_term_size = uint8.unpack_from(descriptor_subblock, 11)[0]
+    line_term_char = descriptor_subblock[12:13]
     if line_term_size == 2:
-        line_term_char += unpack(endian+b'c', descriptor_subblock[13:14])[0]
+        line_term_char = descriptor_subblock[12:14]
 
     # ------------------------------------------------------------
     # Reserved sub-block
@@ -165,28 +165,23 @@ def _read_file_descriptor(fpointer):
     # Read the trace pointer sub-block (bytes 32 through 32+[4(N-1)])
     trace_pointer_subblock = fpointer.read(trace_pointer_subblock_size)
 
-    # Get pointers to trace descriptor blocks
-    trace_pointer = []
-    for itrace in range(0, number_of_traces):
-        index = itrace*4
-        pointer = unpack(endian+b'L', trace_pointer_subblock[index:index+4])[0]
-        trace_pointer.append(pointer)
+    # Get pointers to trace descriptor blocks (unsigned 32-bit integers)
+    trace_pointer = np.frombuffer(trace_pointer_subblock, dtype=endian.decode()+'u4',
+                                  count=number_of_traces).tolist()
 
     # Read the free format section
     free_form_pointer = fpointer.read(2) #608-32+64)
-    free_form_offset = unpack(endian+b'h', free_form_pointer[0:2])[0]
+    free_form_offset = int16.unpack_from(free_form_pointer, 0)[0]
+    file_descriptor = dict(FILE_DESCRIPTOR)
     while(free_form_offset != 0):
-        text_free_form= ''
-        text_pointer = fpointer.read(free_form_offset-2)
-        for i in range(0, free_form_offset-2):
-            text_free_form += unpack(endian+b's', text_pointer[i:i+1])[0].decode()
+        text_free_form = fpointer.read(free_form_offset-2).decode('latin-1')
         key = text_free_form.split()[0]
         if key in FILE_DESCRIPTOR:
-            FILE_DESCRIPTOR[key] = ' '.join(text_free_form.split()[1:])
+            file_descriptor[key] = ' '.join(text_free_form.split()[1:])
         free_form_pointer = fpointer.read(2) #608-32+64)
-        free_form_offset = unpack(endian+b'h', free_form_pointer[0:2])[0]
+        free_form_offset = int16.unpack_from(free_form_pointer, 0)[0]
 
-    return endian, revision_id, trace_pointer, dict(FILE_DESCRIPTOR), string_term_char, line_term_char
+    return endian, revision_id, trace_pointer, file_descriptor, string_term_char, line_term_char
 
 def _read_traces(seg2stream, fpointer, endian, trace_pointer, string_term_char, line_term_char, scalco, scalel):
     """
@@ -194,7 +189,7 @@ def _read_traces(seg2stream, fpointer, endian, trace_pointer, string_term_char,
     `trace descrptior block` and `trace data block`.
 
     :param seg2stream: Stream object
-    :param fpointer: pointer containing the file to read
+    :param fpointer: memory map of the file to read
     :param endian: endianess
     :param trace_pointer: pointer to the trace descriptor
     """
@@ -202,139 +197,102 @@ def _read_traces(seg2stream, fpointer, endian, trace_pointer, string_term_char,
     # Get the number of traces
     ntraces = np.size(trace_pointer)
 
+    # Get binary formats for this endianess
+    int16 = STRUCTS[endian][b'h']
+    trace_descriptor = STRUCTS[endian][b'2xHLLB']
+
+    # Decode the string terminator once for the whole file
+    string_term = string_term_char.decode()
+
     # Loop over traces
     for itrace in range(0, ntraces):
-        # Seek trace position in file
-        fpointer.seek(trace_pointer[itrace], 0)
-        # Read the trace descriptor
-        trace_descriptor = fpointer.read(32)
-        # Get the block size
-        size_block = unpack(endian+b'H', trace_descriptor[2:4])[0]
-        # Get the size of the corresponding data block
-        size_data_block = unpack(endian+b'L', trace_descriptor[4:8])[0]
-        # Get the number of samples
-        ns = unpack(endian+b'L', trace_descriptor[8:12])[0]
-        # Get the data code
-        data_code = unpack(endian + b'B', trace_descriptor[12:13])[0]
-        if data_code == 1:
-            seg2stream.datatype = np.int16
-        if data_code == 2:
-            seg2stream.datatype = np.int32
+        # Read the fixed part of the trace descriptor (32 bytes) at once:
+        # block size, size of the corresponding data block, number of
+        # samples and data code
+        size_block, size_data_block, ns, data_code = trace_descriptor.unpack_from(fpointer, trace_pointer[itrace])
+        # Seek the free format section
+        fpointer.seek(trace_pointer[itrace]+32, 0)
+        if data_code in DATA_CODE:
+            seg2stream.datatype = DATA_CODE[data_code]
         if data_code == 3:
             print('20-bit floating point is unsupported')
-        if data_code == 4:
-            seg2stream.datatype = np.float32
-        if data_code == 5:
-            seg2stream.datatype = np.float64
         # Read the free format section
         free_form_pointer = fpointer.read(2) #608-32+64)
-        free_form_offset = unpack(endian+b'h', free_form_pointer[0:2])[0]
+        free_form_offset = int16.unpack_from(free_form_pointer, 0)[0]
 
         # Create
         if itrace == 0:
             seg2stream.create(np.zeros((ntraces, ns), dtype=seg2stream.datatype))
             seg2stream.ntrac = ntraces
+            # Header columns filled trace by trace and assigned at once after
+            # the loop
+            columns = {key: seg2stream.header[key].copy() for key in HEADER_COLUMNS}
 
+        # Trace descriptor initialized with the default values (the module
+        # dictionary itself is never modified)
         seg2stream.trace_descriptor.append(dict(TRACE_DESCRIPTOR))
 
         while(free_form_offset != 0):
 
-            # Declare a temporary header
-            #tmp_header = dict(TRACE_DESCRIPTOR)
-
-            text_free_form= ''
-            text_pointer = fpointer.read(free_form_offset-2)
-
-            for i in range(0, free_form_offset-2):
-                text_free_form += unpack(endian+b's', text_pointer[i:i+1])[0].decode()
+            text_free_form = fpointer.read(free_form_offset-2).decode('latin-1')
             key = text_free_form.split()[0]
+            value = ' '.join(text_free_form.split()[1:])
 
             if key in TRACE_DESCRIPTOR:
-                TRACE_DESCRIPTOR[key] = ' '.join(text_free_form.split()[1:])
-                seg2stream.trace_descriptor[itrace][key] = ' '.join(text_free_form.split()[1:])
+                seg2stream.trace_descriptor[itrace][key] = value
 
             if key == 'SAMPLE_INTERVAL':
-                delta = np.float64(TRACE_DESCRIPTOR[key].rstrip(string_term_char.decode()).split())
-                seg2stream.trace_descriptor[itrace][key] = delta[0]
+                delta = np.float64(value.rstrip(string_term).split()[0])
+                seg2stream.trace_descriptor[itrace][key] = delta
 
             if key == 'DATUM':
-                datum = np.float64(TRACE_DESCRIPTOR[key].rstrip(string_term_char.decode()))
+                datum = np.float64(value.rstrip(string_term))
                 seg2stream.trace_descriptor[itrace][key] = datum
 
             if key == 'DELAY':
-                delay = float(TRACE_DESCRIPTOR[key].rstrip(string_term_char.decode()))
+                delay = float(value.rstrip(string_term))
                 seg2stream.trace_descriptor[itrace][key] = delay
 
             if key == 'RECEIVER_LOCATION':
-                srecloc = (TRACE_DESCRIPTOR[key].rstrip(string_term_char.decode())).split()
-                recloc = []
-                for i in range(len(srecloc)):
-                    recloc.append(float(srecloc[i]))
+                recloc = list(map(float, value.rstrip(string_term).split()))
                 seg2stream.trace_descriptor[itrace][key] = recloc
 
             if key == 'SOURCE_LOCATION':
-                ssrcloc = (TRACE_DESCRIPTOR[key].rstrip(string_term_char.decode())).split()
-                srcloc = []
-                for i in range(len(ssrcloc)):
-                    srcloc.append(float(ssrcloc[i]))
+                srcloc = list(map(float, value.rstrip(string_term).split()))
                 seg2stream.trace_descriptor[itrace][key] = srcloc
             free_form_pointer = fpointer.read(2) #608-32+64)
-            free_form_offset = unpack(endian+b'h', free_form_pointer[0:2])[0]
-
-        # Seek trace position in file
-        fpointer.seek(trace_pointer[itrace], 0)
-        fpointer.read(size_block)
-        data_array = np.frombuffer(fpointer.read(ns*data_code), dtype=np.float32)
+            free_form_offset = int16.unpack_from(free_form_pointer, 0)[0]
 
-        seg2stream.traces[itrace, :] = data_array[:]
+        # Read the data block with the sample format given by the data code
+        if data_code in DATA_CODE:
+            data_type = np.dtype(DATA_CODE[data_code]).newbyteorder(endian.decode())
+            # (copied without keeping a view, so that the map can be closed)
+            seg2stream.traces[itrace, :] = np.frombuffer(fpointer, dtype=data_type, count=ns,
+                                                         offset=trace_pointer[itrace]+size_block)
 
         # -------------------------------------
         # Convert SEG2 to SU/CWP rev0 format
         # -------------------------------------
 
-        # Trace number in line
-        hdrtype = SUHEADER['tracl']
-        seg2stream.header[itrace]['tracl'] = hdrtype(itrace+1)
-
-        # Trace number in reel
-        hdrtype = SUHEADER['tracr']
-        seg2stream.header[itrace]['tracr'] = hdrtype(itrace+1)
-
-        # Trace number in file
-        hdrtype = SUHEADER['tracf']
-        seg2stream.header[itrace]['tracf'] = hdrtype(itrace+1)
-
         # Trace identification code
-        hdrtype = SUHEADER['trid']
-        if seg2stream.trace_descriptor[itrace]['TRACE_TYPE'] == 'UNKNOW': #tmp_header['TRACE_TYPE'] == 'UNKNOWN':
-            seg2stream.header[itrace]['trid'] = hdrtype(0)
-        if seg2stream.trace_descriptor[itrace]['TRACE_TYPE'] == 'SEISMIC_DATA': #tmp_header['TRACE_TYPE'] == 'SEISMIC_DATA':
-            seg2stream.header[itrace]['trid'] = hdrtype(1)
-        if seg2stream.trace_descriptor[itrace]['TRACE_TYPE'] == 'DEAD': #tmp_header['TRACE_TYPE'] == 'DEAD':
-            seg2stream.header[itrace]['trid'] = hdrtype(2)
-        if seg2stream.trace_descriptor[itrace]['TRACE_TYPE'] == 'TEST_DATA': #tmp_header['TRACE_TYPE'] == 'TEST_DATA':
-            seg2stream.header[itrace]['trid'] = hdrtype(3)
-        if seg2stream.trace_descriptor[itrace]['TRACE_TYPE'] == 'UPHOLE': #tmp_header['TRACE_TYPE'] == 'UPHOLE':
-            seg2stream.header[itrace]['trid'] = hdrtype(4)
+        trace_type = seg2stream.trace_descriptor[itrace]['TRACE_TYPE']
+        if trace_type in TRACE_TYPE:
+            columns['trid'][itrace] = TRACE_TYPE[trace_type]
 
         # Number of samples
-        hdrtype = SUHEADER['ns']
-        seg2stream.header[itrace]['ns'] = hdrtype(ns)
+        columns['ns'][itrace] = ns
 
         # Sample interval
         if delta < 1.e-6:
-            hdrtype = SUHEADER['dt']
-            seg2stream.header[itrace]['dt'] = hdrtype(np.float32(delta)*np.float32(1000.)*np.float32(1000000.))
+            columns['dt'][itrace] = np.float32(delta)*np.float32(1000.)*np.float32(1000000.)
             seg2stream.units0 = 'milliseconds'
         else:
-            hdrtype = SUHEADER['dt']
-            seg2stream.header[itrace]['dt'] = hdrtype(delta*1000000.)
+            columns['dt'][itrace] = delta*1000000.
 
         # Delay
         if delay  < 1:
             delay *= 1000.
-            hdrtype = SUHEADER['delrt']
-            seg2stream.header[itrace]['delrt'] = hdrtype(delay)
+            columns['delrt'][itrace] = delay
 
         # Coordinates
         #calc_scalco = False
@@ -357,42 +315,22 @@ def _read_traces(seg2stream, fpointer, endian, trace_pointer, string_term_char,
         #            scalco = 10000.
 
 
-        hdrtype = SUHEADER['scalco']
-        if(scalco < 1):
-            seg2stream.header[itrace]['scalco'] = hdrtype(scalco)
-            # Fill coordinates
-            if len(recloc) == 1:
-                hdrtype = SUHEADER['gx']
-                seg2stream.header[itrace]['gx'] = hdrtype(recloc[0]*abs(scalco))
-            else:
-                hdrtype = SUHEADER['gx']
-                seg2stream.header[itrace]['gx'] = hdrtype(recloc[0]*abs(scalco))
-                seg2stream.header[itrace]['gy'] = hdrtype(recloc[1]*abs(scalco))
-            if len(srcloc) == 1:
-                hdrtype = SUHEADER['sx']
-                seg2stream.header[itrace]['sx'] = hdrtype(srcloc[0]*abs(scalco))
-            else:
-                hdrtype = SUHEADER['sx']
-                seg2stream.header[itrace]['sx'] = hdrtype(srcloc[0]*abs(scalco))
-                seg2stream.header[itrace]['sy'] = hdrtype(srcloc[1]*abs(scalco))
-
-        if(scalco >= 1):
-            seg2stream.header[itrace]['scalco'] = hdrtype(scalco)
-            # Fill coordinates
-            if len(recloc) == 1:
-                hdrtype = SUHEADER['gx']
-                seg2stream.header[itrace]['gx'] = hdrtype(recloc[0]/scalco)
-            else:
-                hdrtype = SUHEADER['gx']
-                seg2stream.header[itrace]['gx'] = hdrtype(recloc[0]/scalco)
-                seg2stream.header[itrace]['gy'] = hdrtype(recloc[1]/scalco)
-            if len(srcloc) == 1:
-                hdrtype = SUHEADER['sx']
-                seg2stream.header[itrace]['sx'] = hdrtype(srcloc[0]/scalco)
-            else:
-                hdrtype = SUHEADER['sx']
-                seg2stream.header[itrace]['sx'] = hdrtype(srcloc[0]/scalco)
-                seg2stream.header[itrace]['sy'] = hdrtype(srcloc[1]/scalco)
+        # Scale coordinates (scalco < 1 is used as a multiplier and
+        # scalco >= 1 as a divisor)
+        if scalco < 1:
+            screcloc = [coord*abs(scalco) for coord in recloc]
+            scsrcloc = [coord*abs(scalco) for coord in srcloc]
+        else:
+            screcloc = [coord/scalco for coord in recloc]
+            scsrcloc = [coord/scalco for coord in srcloc]
+
+        # Fill coordinates
+        columns['gx'][itrace] = screcloc[0]
+        if len(screcloc) > 1:
+            columns['gy'][itrace] = screcloc[1]
+        columns['sx'][itrace] = scsrcloc[0]
+        if len(scsrcloc) > 1:
+            columns['sy'][itrace] = scsrcloc[1]
 
         # Elevation
         # Coordinates
@@ -419,35 +357,32 @@ def _read_traces(seg2stream, fpointer, endian, trace_pointer, string_term_char,
         #        if scalel >= 10000.:
         #            scalel = 10000.
 
-        hdrtype = SUHEADER['scalel']
-        seg2stream.header[itrace]['scalel'] = hdrtype(-1*scalel)
         if len(recloc) == 3:
-            hdrtype = SUHEADER['gelev']
-            seg2stream.header[itrace]['gelev'] = hdrtype(recloc[2]*scalel)
+            columns['gelev'][itrace] = recloc[2]*scalel
         if len(srcloc) == 3:
-            hdrtype = SUHEADER['selev']
-            seg2stream.header[itrace]['selev'] = hdrtype(srcloc[2]*scalel)
+            columns['selev'][itrace] = srcloc[2]*scalel
         if seg2stream.trace_descriptor[itrace]['DATUM'] != 0.: #tmp_header['DATUM'] != 0.:
-            hdrtype = SUHEADER['gdel']
-            seg2stream.header[itrace]['gdel'] = hdrtype(datum*scalel)
-            seg2stream.header[itrace]['sdel'] = hdrtype(datum*scalel)
-
-        # counit type 6 is specific to IFSTTAR REDUCED-SCALE MODELING
-        if seg2stream.file_descriptor['UNITS'] == 'FEET' or seg2stream.file_descriptor['UNITS'] == 'METERS':
-            seg2stream.header[itrace]['counit'] = 1
-            if seg2stream.file_descriptor['UNITS'] == 'FEET':
-                seg2stream.units1 = 'feet'
-            if seg2stream.file_descriptor['UNITS'] == 'METERS':
-                seg2stream.units1 = 'meters'
-        if seg2stream.file_descriptor['UNITS'] == 'INCHES' or seg2stream.file_descriptor['UNITS'] == 'CENTIMETERS':
-            seg2stream.header[itrace]['counit'] = 5
-            if seg2stream.file_descriptor['UNITS'] == 'INCHES':
-                seg2stream.units1 = 'inches'
-            if seg2stream.file_descriptor['UNITS'] == 'CENTIMETERS':
-                seg2stream.units1 = 'centimeters'
-        if seg2stream.file_descriptor['UNITS'] == 'MILLIMETERS':
-            seg2stream.header[itrace]['counit'] = 6
-            seg2stream.units1 = 'millimeters'
+            columns['gdel'][itrace] = datum*scalel
+            columns['sdel'][itrace] = datum*scalel
+
+    # Fill the header columns
+    for key in HEADER_COLUMNS:
+        seg2stream.header[key] = columns[key]
+
+    # Trace number in line, in reel and in file
+    itrac = np.arange(1, ntraces+1, dtype=np.int32)
+    seg2stream.header['tracl'] = itrac
+    seg2stream.header['tracr'] = itrac
+    seg2stream.header['tracf'] = itrac
+
+    # Coordinate and elevation scaling factors
+    seg2stream.header['scalco'] = scalco
+    seg2stream.header['scalel'] = -1*scalel
+
+    # Coordinate units
+    units = seg2stream.file_descriptor['UNITS']
+    if units in UNITS:
+        seg2stream.header['counit'], seg2stream.units1 = UNITS[units]
 
 
 def seg2scan(fname):
@@ -459,16 +394,21 @@ def seg2scan(fname):
     scalel = 1
 
     try:
-        # Try to open file
-        fpointer = open(fname, 'rb')
-        # Create a Stream object
-        seg2stream = Stream()
-        # File format
-        seg2stream.format = 'seg-2'
-        # Read the file header
-        endian, seg2stream.revision, trace_pointer, seg2stream.file_descriptor, string_term_char, line_term_char = _read_file_descriptor(fpointer)
-        # Read trace descriptor and data blocks
-        _read_traces(seg2stream, fpointer, endian, trace_pointer, string_term_char, line_term_char, scalco, scalel)
+        # Try to open file and map it in memory (the map is closed even if
+        # the file cannot be parsed)
+        with open(fname, 'rb') as fobj, \
+             mmap.mmap(fobj.fileno(), 0, access=mmap.ACCESS_READ) as fpointer:
+            # Ask the kernel to read the whole file ahead while parsing
+            if hasattr(mmap, 'MADV_WILLNEED'):
+                fpointer.madvise(mmap.MADV_WILLNEED)
+            # Create a Stream object
+            seg2stream = Stream()
+            # File format
+            seg2stream.format = 'seg-2'
+            # Read the file header
+            endian, seg2stream.revision, trace_pointer, seg2stream.file_descriptor, string_term_char, line_term_char = _read_file_descriptor(fpointer)
+            # Read trace descriptor and data blocks
+            _read_traces(seg2stream, fpointer, endian, trace_pointer, string_term_char, line_term_char, scalco, scalel)
 
         return seg2stream.file_descriptor, seg2stream.trace_descriptor
 
@@ -495,16 +435,21 @@ def seg2read(fname, **options):
     scalel = options.get('scalel', 1)
 
     try:
-        # Try to open file
-        fpointer = open(fname, 'rb')
-        # Create a Stream object
-        seg2stream = Stream()
-        # File format
-        seg2stream.format = 'seg-2'
-        # Read the file header
-        endian, seg2stream.revision, trace_pointer, seg2stream.file_descriptor, string_term_char, line_term_char = _read_file_descriptor(fpointer)
-        # Read trace descriptor and data blocks
-        _read_traces(seg2stream, fpointer, endian, trace_pointer, string_term_char, line_term_char, scalco, scalel)
+        # Try to open file and map it in memory (the map is closed even if
+        # the file cannot be parsed)
+        with open(fname, 'rb') as fobj, \
+             mmap.mmap(fobj.fileno(), 0, access=mmap.ACCESS_READ) as fpointer:
+            # Ask the kernel to read the whole file ahead while parsing
+            if hasattr(mmap, 'MADV_WILLNEED'):
+                fpointer.madvise(mmap.MADV_WILLNEED)
+            # Create a Stream object
+            seg2stream = Stream()
+            # File format
+            seg2stream.format = 'seg-2'
+            # Read the file header
+            endian, seg2stream.revision, trace_pointer, seg2stream.file_descriptor, string_term_char, line_term_char = _read_file_descriptor(fpointer)
+            # Read trace descriptor and data blocks
+            _read_traces(seg2stream, fpointer, endian, trace_pointer, string_term_char, line_term_char, scalco, scalel)
 
         return seg2stream
 
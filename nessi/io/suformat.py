@@ -73,8 +73,8 @@ def _check_format(filename):
 
     # Get value of ns considering 'little endian' format (nsl) and
     # 'big endian' format (nsb).
-    nsl = np.frombuffer(bdata, dtype='<h', count=1, offset=114)[0]
-    nsb = np.frombuffer(bdata, dtype='>h', count=1, offset=114)[0]
+    nsl = int(np.frombuffer(bdata, dtype='<h', count=1, offset=114)[0])
+    nsb = int(np.frombuffer(bdata, dtype='>h', count=1, offset=114)[0])
 
     # Determining endianess, number of samples and number of traces
     if(bsize%((nsl*4)+240) == 0): # Little Endian Format
@@ -215,17 +215,18 @@ def suwrite(object, fname, path='.'):
     # Open file to write
     sufile = open(path+'/'+fname+'.su', 'wb')
 
-    # Get the number of traces
+    # Get the number of traces and the number of samples
     ntrac = len(object.header)
+    ns = np.size(object.traces, axis=-1)
 
-    # If one trace only
-    if ntrac == 1:
-        sufile.write(object.header[:])
-        sufile.write(object.traces[:])
-    else:
-        for itrac in range(0, ntrac):
-            sufile.write(object.header[itrac])
-            sufile.write(object.traces[itrac, :])
+    # Interleave headers and traces in one buffer
+    sudata = np.empty(ntrac, dtype=[('header', object.header.dtype),
+                                    ('trace', np.float32, (ns,))])
+    sudata['header'] = object.header
+    sudata['trace'] = object.traces
+
+    # Write headers and traces at once
+    sudata.tofile(sufile)
 
     # Close file
     sufile.close()
@@ -53,6 +53,3 @@ def test_suformat_suread_2d():
     np.testing.assert_equal(sdata.header[0]['dt'], 100)
     np.testing.assert_equal(sdata.header[0]['trid'], 1)
     np.testing.assert_equal(sdata.header[0]['year'], 2019)
-
-if __name__ == "__main__" :
-    np.testing.run_module_suite()
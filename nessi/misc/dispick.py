@@ -4,8 +4,7 @@ def dispick(object, vpbeg, wpbeg, deltav):
 
     nv = np.size(object.traces, axis=0)
     nw = np.size(object.traces, axis=1)
-    dispn = np.zeros((nv, nw), dtype=np.float32)
-    dispn[:, :] = object.traces[:, :]
+    dispn = np.ascontiguousarray(object.traces, dtype=np.float32)
 
     vmin = object.header[0]['f2']
     dv = object.header[0]['d2']
@@ -18,41 +17,37 @@ def dispick(object, vpbeg, wpbeg, deltav):
     nvp = int(2.*deltav/dv)+1
 
 
-    v = np.linspace(vmin, vmin+float(nv-1)*dv, nv)
-    w = np.linspace(wmin, wmin+float(nw-1)*dw, nw)
+    v = vmin+np.arange(nv)*float(dv)
+    w = wmin+np.arange(nw)*float(dw)
+
+    # Index of the picked velocity for each frequency
+    ivpick = np.zeros(nw, dtype=np.int32)
 
-    curve = np.zeros((nw, 2), dtype=np.float32)
     swap = dispn[:,iwpbeg]
     iloc = np.argmax(swap[(ivpbeg-ideltav-1):(ivpbeg+ideltav-1)])
-    curve[iwpbeg][1] = v[iloc+ivpbeg-ideltav]
-    curve[iwpbeg][0] = w[iwpbeg]
+    ivpick[iwpbeg] = iloc+ivpbeg-ideltav
     ivinit = iloc+ivpbeg-ideltav
     ivnew = iloc+ivpbeg-ideltav
 
     for iw in range(iwpbeg,-1,-1):
-        ilocmin = ivnew-ideltav
-        ilocmax = ivnew+ideltav
-        swap = dispn[:,iw]
-        iloc = np.argmax(swap)
-        while(iloc < ilocmin or iloc > ilocmax):
-            swap[iloc] = 0.
-            iloc = np.argmax(swap)
-        curve[iw][1] = v[iloc]
-        curve[iw][0] = w[iw]
+        ilocmin = max(0, ivnew-ideltav)
+        ilocmax = min(nv-1, ivnew+ideltav)
+        iloc = ilocmin+int(np.argmax(dispn[ilocmin:ilocmax+1, iw]))
+        ivpick[iw] = iloc
         ivnew = iloc
 
     ivnew = ivinit
 
     for iw in range(iwpbeg+1,nw):
-        ilocmin = ivnew-ideltav
-        ilocmax = ivnew+ideltav
-        swap = dispn[:,iw]
-        iloc = np.argmax(swap)
-        while(iloc < ilocmin or iloc > ilocmax):
-            swap[iloc] = 0.
-            iloc = np.argmax(swap)
-        curve[iw][1] = v[iloc]
-        curve[iw][0] = w[iw]
+        ilocmin = max(0, ivnew-ideltav)
+        ilocmax = min(nv-1, ivnew+ideltav)
+        iloc = ilocmin+int(np.argmax(dispn[ilocmin:ilocmax+1, iw]))
+        ivpick[iw] = iloc
         ivnew = iloc
 
+    # Build the dispersion curve (frequency, velocity) at once
+    curve = np.zeros((nw, 2), dtype=np.float32)
+    curve[:, 0] = w
+    curve[:, 1] = v[ivpick]
+
     return curve
@@ -16,6 +16,7 @@ Multichannel Analysis of Surface Wave.
 import numpy as np
 cimport numpy as np
 cimport cython
+from libc.math cimport sqrt, cos, sin, M_PI
 
 ctypedef np.float32_t DTYPE_f
 ctypedef np.complex64_t DTYPE_c
@@ -49,43 +50,67 @@ def cymasw(np.ndarray[DTYPE_c, ndim=2] gtraces, np.ndarray[DTYPE_f, ndim=1] offs
     cdef int nv = np.size(vel)
     cdef int nw = np.size(frq)
 
+    # Check the frequency band and the offsets against the data (the
+    # loops below are not bounds checked)
+    if iwmin < 0 or iwmin+nw > np.size(gtraces, axis=1):
+        raise ValueError('frequency band out of the data spectrum')
+    if np.size(offset) != nr:
+        raise ValueError('offset and data must have the same number of traces')
+
     # Initialize temporary and dispersion diagram arrays
-    cdef np.ndarray[DTYPE_c, ndim=1] tmp = np.zeros(nw, dtype=np.complex64)
+    cdef np.ndarray[DTYPE_f, ndim=2] gre = np.zeros((nr, nw), dtype=np.float32)
+    cdef np.ndarray[DTYPE_f, ndim=2] gim = np.zeros((nr, nw), dtype=np.float32)
     cdef np.ndarray[DTYPE_f, ndim=2] disp = np.zeros((nv, nw), dtype=np.float32)
 
-    # Initialiaze variables
-    cdef DTYPE_c phase
+    # Initialiaze variables
+    cdef double gmax, amp, arg, tmpre, tmpim, awmax
+
+    # Split the spectrum in the frequency band into real and imaginary parts
+    # and apply whitening (the maximum amplitude over traces is computed
+    # once per frequency)
+    for iw in range(0, nw):
+        gmax = 0.
+        if whitening == 1:
+            for ir in range(0, nr):
+                amp = sqrt(gtraces[ir, iw+iwmin].real*gtraces[ir, iw+iwmin].real
+                           +gtraces[ir, iw+iwmin].imag*gtraces[ir, iw+iwmin].imag)
+                if amp > gmax:
+                    gmax = amp
+        if gmax == 0.:
+            gmax = 1.
+        for ir in range(0, nr):
+            gre[ir, iw] = gtraces[ir, iw+iwmin].real/gmax
+            gim[ir, iw] = gtraces[ir, iw+iwmin].imag/gmax
 
     # Loop over velocities
     for iv in range(0, nv):
-        # Initialize temporary vector
+        # Loop over frequencies
         for iw in range(0, nw):
-            tmp[iw] = complex(0., 0.)
-        # Loop over traces
-        for ir in range(0, nr):
-            # Loop over frequencies
-            for iw in range(0, nw):
+            tmpre = 0.
+            tmpim = 0.
+            # Stack over receivers
+            for ir in range(0, nr):
                 # Calculate the phase
                 if vel[iv] != 0.:
-                  phase = complex(0., 1.)*2.*np.pi*offset[ir]*frq[iw]/vel[iv]
+                    arg = 2.*M_PI*offset[ir]*frq[iw]/vel[iv]
                 else:
-                  phase = complex(0., 0.)
-                # Stack over frequencies and receivers
-                if(whitening == 1 and np.amax(np.abs(gtraces[:, iw+iwmin]))!= 0):
-                  tmp[iw] = tmp[iw]+gtraces[ir, iw+iwmin]/np.amax(np.abs(gtraces[:, iw+iwmin]))*np.exp(phase)
-                else: # whitening == False
-                  tmp[iw] = tmp[iw]+gtraces[ir, iw+iwmin]*np.exp(phase)
-        # Stack over velocities
-        for iw in range(0, nw):
-            disp[iv,iw] = disp[iv, iw]+np.abs(tmp[iw])
+                    arg = 0.
+                tmpre = tmpre+gre[ir, iw]*cos(arg)-gim[ir, iw]*sin(arg)
+                tmpim = tmpim+gre[ir, iw]*sin(arg)+gim[ir, iw]*cos(arg)
+            # Stack over velocities
+            disp[iv, iw] = sqrt(tmpre*tmpre+tmpim*tmpim)
 
     # Normalize
     if normalize  == 1:
       for iw in range(0, nw):
         # Get the maximum value for the current frequency
-        awmax = np.amax(disp[:, iw])
-        # Loop over velocities
+        awmax = 0.
         for iv in range(0, nv):
-            disp[iv, iw] = disp[iv, iw]/awmax
+            if disp[iv, iw] > awmax:
+                awmax = disp[iv, iw]
+        # Loop over velocities
+        if awmax != 0.:
+            for iv in range(0, nv):
+                disp[iv, iw] = disp[iv, iw]/awmax
 
     return disp
@@ -17,20 +17,24 @@ Data filtering functions.
     (https://www.gnu.org/copyleft/lesser.html)
 """
 
+from functools import lru_cache
 import numpy as np
+import scipy.fft
 
-def getfilter(ns, ds, freq, amps):
+@lru_cache(maxsize=32)
+def _getfilter(ns, ds, freq, amps):
     """
-    Return only the zero-phase, sine-squared filter.
+    Cached zero-phase, sine-squared filter; the returned array is shared
+    and must not be modified.
 
     :param ns: number of samples
     :param ds: data sampling
-    :param freq: array (1D) of filter frequencies (Hz)
-    :param amps: array (1D) of filter amplitudes
+    :param freq: tuple of filter frequencies (Hz)
+    :param amps: tuple of filter amplitudes
     """
 
     # Get the frequency array
-    ftmp = np.fft.rfftfreq(ns, ds)
+    ftmp = scipy.fft.rfftfreq(ns, ds)
 
     # Get the number of frequency samples
     nfft = len(ftmp)
@@ -41,89 +45,80 @@ def getfilter(ns, ds, freq, amps):
     # Get the frequency sampling
     df = ftmp[1]
 
-    # Get the number of filter frequencies
-    npoly = len(freq)
-
     # Integer filter frequencies
-    intfreq = np.zeros(npoly, dtype=np.int)
-    for ipoly in range(0, npoly):
-        intfreq[ipoly] = int(freq[ipoly]/df)
+    intfreq = (np.asarray(freq)/df).astype(np.int32)
+    amps = np.asarray(amps, dtype=np.float32)
 
     # From 0 to first filter frequency
-    for ifreq in range(0, intfreq[0]):
-        pfilt[ifreq] = amps[0]
+    pfilt[:intfreq[0]] = amps[0]
 
-    # Middle frequencies
-    for ipoly in range(0, npoly-1):
+    # Middle frequencies: segment of each frequency index
+    ifreq = np.arange(intfreq[0], intfreq[-1])
+    iseg = np.searchsorted(intfreq, ifreq, side='right')-1
 
-        c = 0.5*np.pi/float(intfreq[ipoly+1]-intfreq[ipoly])
+    # Increasing or decreasing amplitude (sin^2 tapering); the sign of
+    # the phase does not matter and a stable amplitude gives a=0
+    # (computed in single precision as the filter itself)
+    with np.errstate(divide='ignore'):
+        c = (0.5*np.pi/np.diff(intfreq).astype(np.float64)).astype(np.float32)
+    s = np.sin(c[iseg]*(ifreq-intfreq[iseg]).astype(np.float32))
+    a = amps[1:]-amps[:-1]
+    pfilt[ifreq] = amps[iseg]+a[iseg]*s*s
 
-        # Increasing amplitude
-        if amps[ipoly] < amps[ipoly+1]:
-            for ifreq in range(intfreq[ipoly], intfreq[ipoly+1]):
-                s = np.sin(c*float(ifreq-intfreq[ipoly]))
-                a = amps[ipoly+1]-amps[ipoly]
-                pfilt[ifreq] = amps[ipoly]+a*s*s
+    # From the last filter frequency to the last frequency
+    pfilt[intfreq[-1]:] = amps[-1]
 
-        # Decreasing amplitude
-        if amps[ipoly] > amps[ipoly+1]:
-            for ifreq in range(intfreq[ipoly], intfreq[ipoly+1]):
-                s = np.sin(c*float(intfreq[ipoly]-ifreq))
-                a = amps[ipoly]-amps[ipoly+1]
-                pfilt[ifreq] = amps[ipoly]-a*s*s
+    # Shared between calls
+    pfilt.flags.writeable = False
 
-        # Stable amplitude
-        if amps[ipoly] == amps[ipoly+1]:
-            for ifreq in range(intfreq[ipoly], intfreq[ipoly+1]):
-                pfilt[ifreq] = amps[ipoly]
+    return pfilt
 
-    # From the last filter frequency to the last frequency
-    for ifreq in range(intfreq[-1], nfft):
-        pfilt[ifreq] = amps[-1]
+def getfilter(ns, ds, freq, amps):
+    """
+    Return only the zero-phase, sine-squared filter.
 
-    return pfilt
+    :param ns: number of samples
+    :param ds: data sampling
+    :param freq: array (1D) of filter frequencies (Hz)
+    :param amps: array (1D) of filter amplitudes
+    """
+
+    # Copy of the cached filter (the caller may modify it)
+    return _getfilter(ns, float(ds), tuple(map(float, freq)),
+                      tuple(map(float, amps))).copy()
 
 def sin2filter(dobs, ds, freq, amps):
     """
     Applies a zero-phase, sine-squared tapered filter (adapted from the
     sufilter command - Seismic Unix 44R1).
 
-    :param dobs: input data
+    Traces are zero-padded to the next fast FFT length before filtering
+    and trimmed back to ns samples. For lengths which are not 5-smooth
+    (e.g. 1009), the output therefore differs by design from filtering
+    the unpadded traces: the filter is sampled on the padded frequency
+    grid and the circular wrap-around falls in the trimmed padding.
+
+    :param dobs: input data, one trace (ns) or a gather (ntrac, ns)
     :param ds: data sampling
     :param freq: array (1D) of filter frequencies (Hz)
     :param amps: array (1D) of filter amplitudes
     """
 
-    # Get the number of traces, the number of sample and the time sampling
-    nd = np.ndim(dobs)
-    if nd == 1:
-        ntrac = 1
-        axis = 0
-        ns = np.size(dobs, axis=axis)
-    if nd == 2:
-        ntrac = np.size(dobs, axis=0)
-        axis = 1
-        ns = np.size(dobs, axis=axis)
+    # Get the number of samples (time along the last axis for 1D or 2D data)
+    ns = np.size(dobs, axis=-1)
 
-    # Fast Fourier Transform
-    gobs = np.fft.rfft(dobs, axis=axis)
+    # FFT size with small prime factors only (zero-padding)
+    nfft = scipy.fft.next_fast_len(ns, real=True)
 
-    # Calculate the filter
-    pfilt = getfilter(ns, ds, freq, amps)
+    # Fast Fourier Transform (pocketfft, threaded over traces)
+    gobs = scipy.fft.rfft(dobs, n=nfft, axis=-1, workers=-1)
 
-    # Get the number of frequency samples
-    nfft =len(pfilt)
-
-    # Apply filter and Inverse Fast Fourier Transform
-    gfiltered = np.zeros(nfft, dtype=np.complex64)
-    if nd == 1:
-        dout = np.zeros(ns , dtype=np.float32)
-        gfiltered[:] = gobs[:]*pfilt[:]
-        dout[:] = np.fft.irfft(gfiltered, n=ns)
-    if nd == 2:
-        dout = np.zeros((ntrac, ns), dtype=np.float32)
-        for itrac in range(0, ntrac):
-            gfiltered[:] = gobs[itrac, :]*pfilt[:]
-            dout[itrac, :] = np.fft.irfft(gfiltered, n=ns)
-
-    return dout
\ No newline at end of file
+    # Calculate the filter (cached, read only)
+    pfilt = _getfilter(nfft, float(ds), tuple(map(float, freq)),
+                       tuple(map(float, amps)))
+
+    # Apply filter to all traces at once and Inverse Fast Fourier Transform
+    gobs *= pfilt
+    dout = scipy.fft.irfft(gobs, n=nfft, axis=-1, workers=-1)[..., :ns]
+
+    return np.ascontiguousarray(dout, dtype=np.float32)
@@ -26,23 +26,7 @@ def avg(data):
     :param object: input stream object.
     """
 
-    # Get the number of traces and number of samples per trace
-    nd = data.ndim
-    if nd == 1:
-        ntrac = 1
-        ns = len(data)
-    if nd == 2:
-        ntrac = np.size(data, axis=0)
-        ns = np.size(data, axis=1)
-
-    # If 'nd == 1'
-    if nd == 1:
-        avg = np.sum(data[:])/float(ns)
-        data[:] -= avg
-    # If 'nd == 2', loop over traces
-    if nd == 2:
-        for itrac in range(0, ntrac):
-            avg = np.sum(data[itrac, :])/float(ns)
-            data[itrac, :] -= avg
+    # Remove the average along the time axis (last axis) of all traces
+    data -= np.mean(data, axis=-1, keepdims=True)
 
     return data
\ No newline at end of file
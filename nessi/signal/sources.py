@@ -18,6 +18,7 @@ Source related functions.
 """
 
 import numpy as np
+import scipy.fft
 
 def lsrcinv(dcal, scal, dobs, axis=0):
     """
@@ -29,52 +30,32 @@ def lsrcinv(dcal, scal, dobs, axis=0):
     :param axis: time axis if dobs is a 2D array
     """
 
-    # Get number of time samples and numner of traces
+    # Get number of time samples
     if np.ndim(dobs) == 1:
-        ns = np.size(dobs)
-        ntrac = 1
-        axis=0
-    else:
-        if axis == 0:
-            ns = np.size(dobs, axis=0)
-            ntrac = np.size(dobs, axis=1)
-        if axis == 1:
-            ns = np.size(dobs, axis=1)
-            ntrac = np.size(dobs, axis=0)
-
-    # Fast Fourier transform
-    gobs = np.fft.rfft(dobs, axis=axis)
-    gcal = np.fft.rfft(dcal, axis=axis)
-    gscal = np.fft.rfft(scal)
-    nfft = len(gscal)
-
-    # Linear source inversion
-    num = np.zeros(nfft, dtype=np.complex64)
-    den = np.zeros(nfft, dtype=np.complex64)
-
-    if ntrac == 1:
-        for iw in range(0, nfft):
-            num[iw] += gcal[iw]*np.conj(gobs[iw])
-            den[iw] += gcal[iw]*np.conj(gcal[iw])
-    else:
-        if axis == 0:
-            for iw in range(0, nfft):
-                for itrac in range(0, ntrac):
-                    num[iw] += gcal[iw][itrac]*np.conj(gobs[iw][itrac])
-                    den[iw] += gcal[iw][itrac]*np.conj(gcal[iw][itrac])
-        if axis == 1:
-            for iw in range(0, nfft):
-                for itrac in range(0, ntrac):
-                    num[iw] += gcal[itrac][iw]*np.conj(gobs[itrac][iw])
-                    den[iw] += gcal[itrac][iw]*np.conj(gcal[itrac][iw])
+        axis = 0
+    ns = np.size(dobs, axis=axis)
+
+    # Fast Fourier transform (pocketfft, keeps single precision)
+    gobs = scipy.fft.rfft(dobs, axis=axis, workers=-1)
+    gcal = scipy.fft.rfft(dcal, axis=axis, workers=-1)
+    gscal = scipy.fft.rfft(scal)
+
+    # Linear source inversion (sum over traces if any)
+    num = gcal*np.conj(gobs)
+    den = gcal*np.conj(gcal)
+    if np.ndim(dobs) == 2:
+        num = np.sum(num, axis=1-axis)
+        den = np.sum(den, axis=1-axis)
+    num = num.astype(np.complex64)
+    den = den.astype(np.complex64)
 
     # Estimated source
+    nfft = len(gscal)
     gsinv = np.zeros(nfft, dtype=np.complex64)
     gcorrector = np.zeros(nfft, dtype=np.complex64)
-    for iw in range(0, nfft):
-        if den[iw] != complex(0., 0.):
-            gsinv[iw] = gscal[iw]*np.conj(num[iw]/den[iw])
-            gcorrector[iw] = num[iw]/den[iw]
-    sinv = np.float32(np.fft.irfft(gsinv, n=ns))
+    iw = den != complex(0., 0.)
+    gcorrector[iw] = num[iw]/den[iw]
+    gsinv[iw] = gscal[iw]*np.conj(gcorrector[iw])
+    sinv = np.float32(scipy.fft.irfft(gsinv, n=ns))
 
     return sinv, gcorrector
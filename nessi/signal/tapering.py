@@ -29,20 +29,11 @@ def _linear(n, ntap1, ntap2, datatype=np.float32):
     """
 
     # Initialize taper function
-    ftap = np.zeros(n, dtype=datatype)
-    ftap[:] = 1
+    ftap = np.ones(n, dtype=datatype)
 
     # Create the taper function
-    for i in range(0, ntap1):
-        if i == 0:
-            ftap[i] = 0.
-        else:
-            ftap[i] = float(i)/float(ntap1)
-    for i in range(0, ntap2):
-        if i == 0:
-            ftap[n-i-1] = 0.
-        else:
-            ftap[n-i-1] = float(i)/float(ntap2)
+    ftap[:ntap1] = np.arange(0, ntap1)/float(ntap1)
+    ftap[n-ntap2:][::-1] = np.arange(0, ntap2)/float(ntap2)
 
     return ftap
 
@@ -56,20 +47,11 @@ def _sine(n, ntap1, ntap2, datatype=np.float32):
     """
 
     # Initialize taper function
-    ftap = np.zeros(n, dtype=datatype)
-    ftap[:] = 1
+    ftap = np.ones(n, dtype=datatype)
 
     # Create the taper function
-    for i in range(0, ntap1):
-        if i == 0:
-            ftap[i] = 0.
-        else:
-            ftap[i] = np.sin(np.pi*float(i)/float(ntap1)/2.)
-    for i in range(0, ntap2):
-        if i == 0:
-            ftap[n-i-1] = 0.
-        else:
-            ftap[n-i-1] = np.sin(np.pi*float(i)/float(ntap2)/2.)
+    ftap[:ntap1] = np.sin(np.pi*np.arange(0, ntap1)/float(ntap1)/2.)
+    ftap[n-ntap2:][::-1] = np.sin(np.pi*np.arange(0, ntap2)/float(ntap2)/2.)
 
     return ftap
 
@@ -83,20 +65,11 @@ def _cosine(n, ntap1, ntap2, datatype=np.float32):
     """
 
     # Initialize taper function
-    ftap = np.zeros(n, dtype=datatype)
-    ftap[:] = 1
+    ftap = np.ones(n, dtype=datatype)
 
     # Create the taper function
-    for i in range(0, ntap1):
-        if i == 0:
-            ftap[i] = 0.
-        else:
-            ftap[i] = 0.5*(1.0-np.cos(np.pi*float(i)/float(ntap1)))
-    for i in range(0, ntap2):
-        if i == 0:
-            ftap[n-i-1] = 0.
-        else:
-            ftap[n-i-1] = 0.5*(1.0-np.cos(np.pi*float(i)/float(ntap2)))
+    ftap[:ntap1] = 0.5*(1.0-np.cos(np.pi*np.arange(0, ntap1)/float(ntap1)))
+    ftap[n-ntap2:][::-1] = 0.5*(1.0-np.cos(np.pi*np.arange(0, ntap2)/float(ntap2)))
 
     return ftap
 
@@ -130,6 +103,8 @@ def time_taper(data, dt=0.01, **options):
         ns = np.size(data, axis=1)
 
     # Calculate the number of points to taper at begining and at end
+    ntap1 = 0
+    ntap2 = 0
     if(tbeg !=0. or tend !=0.):
         ntap1 = int(tbeg/1000./dt)+1
         ntap2 = int(tend/1000./dt)+1
@@ -142,11 +117,7 @@ def time_taper(data, dt=0.01, **options):
     if type == 'cosine':
         ftap = _cosine(ns, ntap1, ntap2, datatype=datatype)
 
-    # Apply the taper function
-    if ndim == 1:
-        data[:] *= ftap[:]
-    else:
-        for itrac in range(0, ntrac):
-            data[itrac, :] *= ftap[:]
+    # Apply the taper function (broadcast over traces)
+    data *= ftap
 
     return data
@@ -168,6 +168,3 @@ def test_taper_cosine_1d():
 
     # Testing
     np.testing.assert_allclose(dobst, output, atol=1.e-4)
-
-if __name__ == "__main__" :
-    np.testing.run_module_suite()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# -------------------------------------------------------------------
+# Filename: test_windowing.py
+#   Author: Damien Pageot
+#    Email: nessi.develop@protonmail.com
+#
+# Copyright (C) 2018, 2019 Damien Pageot
+# ------------------------------------------------------------------
+"""
+Test suite for the windowing functions (nessi.signal.windowing)
+
+:copyright:
+    Damien Pageot (nessi.develop@protonmail.com)
+:license:
+    GNU Lesser General Public License, Version 3
+    (https://www.gnu.org/copyleft/lesser.html)
+"""
+
+import numpy as np
+import pytest
+from nessi.signal.windowing import timeWindow
+
+# List of test functions
+# - test_timewindow_1d()
+# - test_timewindow_2d()
+# - test_timewindow_rounding()
+
+def test_timewindow_1d():
+    """
+    signal.windowing.timeWindow testing on a single trace.
+    """
+
+    # Create initial data trace
+    ns = 128
+    dt = 0.01
+    dobs = np.arange(ns, dtype=np.float32)
+
+    # Windowing
+    dwin = timeWindow(dobs, dt, 0.05, 0.25, 0.55)
+
+    # Attempted output
+    output = np.arange(30, 61, dtype=np.float32)
+
+    np.testing.assert_array_equal(dwin, output)
+
+def test_timewindow_2d():
+    """
+    signal.windowing.timeWindow testing on a gather along the time axis.
+    """
+
+    # Create initial data gather
+    ntrac = 8
+    ns = 128
+    dt = 0.01
+    dobs = np.tile(np.arange(ns, dtype=np.float32), (ntrac, 1))
+
+    # Windowing
+    dwin = timeWindow(dobs, dt, 0., 0.3, 0.6)
+    dwint = timeWindow(dobs.T, dt, 0., 0.3, 0.6, axis=0)
+
+    # Attempted output
+    output = np.tile(np.arange(30, 61, dtype=np.float32), (ntrac, 1))
+
+    np.testing.assert_array_equal(dwin, output)
+    np.testing.assert_array_equal(dwint.T, output)
+
+    # Contiguous copy of the window
+    dwinc = timeWindow(dobs, dt, 0., 0.3, 0.6, contiguous=True)
+    assert dwinc.flags['C_CONTIGUOUS']
+    assert not np.shares_memory(dwinc, dobs)
+    np.testing.assert_array_equal(dwinc, output)
+
+    # Copy to a preallocated array
+    dout = np.zeros((ntrac, 31), dtype=np.float32)
+    dwino = timeWindow(dobs, dt, 0., 0.3, 0.6, out=dout)
+    assert dwino is dout
+    np.testing.assert_array_equal(dout, output)
+
+def test_timewindow_rounding():
+    """
+    signal.windowing.timeWindow testing of sample index rounding and bounds.
+    """
+
+    # Create initial data trace
+    ns = 128
+    dt = 0.001
+    dobs = np.arange(ns, dtype=np.float32)
+
+    # (tmin+delay)/dt is slightly below an integer in floating point
+    dwin = timeWindow(dobs, dt, 0., 0.043, 0.071)
+    np.testing.assert_array_equal(dwin, np.arange(43, 72, dtype=np.float32))
+
+    # Window out of the data
+    with pytest.raises(ValueError):
+        timeWindow(dobs, dt, 0., 0.1, 0.2)
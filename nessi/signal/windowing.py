@@ -1,7 +1,7 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 # -------------------------------------------------------------------
-# Filename: tapering.py
+# Filename: windowing.py
 #   Author: Damien Pageot
 #    Email: nessi.develop@protonmail.com
 #
@@ -19,22 +19,51 @@ Data windowing functions.
 
 import numpy as np
 
-def timeWindow(data, dt, delay, tmin, tmax):
+def timeWindow(data, dt, delay, tmin, tmax, axis=-1, contiguous=False,
+               out=None):
     """
+    Extract a time window from data.
+
+    Gathers are windowed in a single slice, all traces sharing the same
+    window. Data are expected with samples along the last (fastest) axis,
+    i.e. (ntrac, ns) for a gather, so that the window of each trace is a
+    contiguous block of memory.
+
+    The returned window shares memory with data; use contiguous for a new
+    contiguous copy, or out to copy into a preallocated array (e.g. when
+    windowing traces one by one in a loop).
+
+    :param data: numpy array (1D trace or 2D gather)
+    :param dt: time sampling
+    :param delay: delay recording time
+    :param tmin: start time of the window
+    :param tmax: end time of the window
+    :param axis: time axis of data (default=-1)
+    :param contiguous: return a C-contiguous copy instead of a view, as
+        expected by the compiled kernels (default=False)
+    :param out: (optional) array receiving a copy of the window
     """
 
-    # Get the number of samples
-    ns = len(data)
+    # Get start and end index (rounded half to even, as np.rint)
+    startIndex = int(round((tmin+delay)/dt))
+    endIndex = int(round((tmax+delay)/dt))
+
+    # Check the window lies within the data
+    ns = data.shape[axis]
+    if startIndex < 0 or endIndex >= ns:
+        raise ValueError('time window out of data bounds')
 
-    # Get data lenght
-    dataLenght = float(ns-1)*dt
+    # Slice along the time axis
+    window = [slice(None)]*data.ndim
+    window[axis] = slice(startIndex, endIndex+1)
 
-    # Get start and end time
-    startTime = -1.*delay
-    endTime = startTime+dataLenght
+    # Copy the window to the output array if any
+    if out is not None:
+        np.copyto(out, data[tuple(window)])
+        return out
 
-    # Get start and end index
-    startIndex = int((tmin+delay)/dt)
-    endIndex = int((tmax+delay)/dt)
+    # Copy the window to contiguous memory if requested
+    if contiguous:
+        return np.ascontiguousarray(data[tuple(window)])
 
-    return data[startIndex:endIndex+1]
+    return data[tuple(window)]
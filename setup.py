@@ -1,12 +1,20 @@
 #! /usr/bin/env python
 # -*- coding: utf-8 -*-
 
-from setuptools import setup, find_packages
-from Cython.Build import cythonize
+from setuptools import setup, find_packages, Extension
 import numpy
+import glob
 import io
 import os
 import sys
+import multiprocessing
+
+# Cython is only needed to translate the pyx files; without it the
+# extensions are built from the C files shipped in the source distribution
+try:
+    from Cython.Build import cythonize
+except ImportError:
+    cythonize = None
 
 # Package meta-data.
 NAME = 'NeSSI'
@@ -14,7 +22,7 @@ DESCRIPTION = 'NeSSI for rapid development of seismic inversion codes.'
 URL = 'https://framagit.org/PageotD/nessi/'
 EMAIL = 'damien.pageot@protonmail.com'
 AUTHOR = 'Damien Pageot'
-REQUIRES_PYTHON = '>=3.0'
+REQUIRES_PYTHON = '>=3.7'
 VERSION = '0.3.0'
 
 # Packages are required for NeSSI to be executed
@@ -27,6 +35,48 @@ EXTRAS = {}
 
 here = os.path.abspath(os.path.dirname(__file__))
 
+# Cython sources
+PYX = sorted(glob.glob("nessi/modbuilder/*.pyx")
+             +glob.glob("nessi/modeling/swm/*.pyx")
+             +glob.glob("nessi/signal/dsp/*.pyx")
+             +glob.glob("nessi/misc/source_estimation/*.pyx"))
+
+# Optimization flags for the compiled kernels (with link-time
+# optimization for GCC/Clang); NESSI_MARCH selects the target instruction
+# set (e.g. NESSI_MARCH=native, or AVX2 with MSVC), left unset for
+# portable builds
+if sys.platform == 'win32':
+    COMPILE_ARGS = ['/O2']
+    LINK_ARGS = []
+else:
+    COMPILE_ARGS = ['-O3', '-flto']
+    LINK_ARGS = ['-flto']
+MARCH = os.environ.get('NESSI_MARCH')
+if MARCH:
+    if sys.platform == 'win32':
+        COMPILE_ARGS.append('/arch:'+MARCH)
+    else:
+        COMPILE_ARGS.append('-march='+MARCH)
+
+# One extension per pyx file, compiled from the generated C file when
+# Cython is not available
+EXTENSIONS = [Extension(os.path.splitext(pyx)[0].replace(os.sep, '.').replace('/', '.'),
+                        [pyx if cythonize else os.path.splitext(pyx)[0]+'.c'],
+                        include_dirs=[numpy.get_include()],
+                        define_macros=[('NPY_NO_DEPRECATED_API',
+                                        'NPY_1_7_API_VERSION')],
+                        extra_compile_args=COMPILE_ARGS,
+                        extra_link_args=LINK_ARGS)
+              for pyx in PYX]
+
+# Translate the modules in parallel only with the fork start method: with
+# spawn (Windows, macOS) the workers re-import this script and the build
+# fails
+if multiprocessing.get_start_method() == 'fork':
+    NTHREADS = os.cpu_count()
+else:
+    NTHREADS = 0
+
 # Import the README and use it as the long-description.
 # Note: this will only work if 'README.md' is present in your MANIFEST.in file!
 try:
@@ -61,23 +111,13 @@ setup(
         'License :: OSI Approved :: GNU Lesser General Public License v3 (LGPLv3)',
         'Programming Language :: Python',
         'Programming Language :: Python :: 3',
-        'Programming Language :: Python :: 3.0',
-        'Programming Language :: Python :: 3.1',
-        'Programming Language :: Python :: 3.2',
-        'Programming Language :: Python :: 3.3',
-        'Programming Language :: Python :: 3.4',
-        'Programming Language :: Python :: 3.5',
-        'Programming Language :: Python :: 3.6',
         'Programming Language :: Python :: 3.7',
         'Programming Language :: Cython',
         ],
 
     # Cythonize
-    ext_modules = cythonize(["nessi/modbuilder/*.pyx",
-                             "nessi/modeling/swm/*.pyx",
-                             "nessi/signal/dsp/*.pyx",
-                             "nessi/misc/source_estimation/*.pyx"],
-                             compiler_directives={'language_level' : "3"}),
-    include_dirs = [numpy.get_include()],
+    ext_modules = cythonize(EXTENSIONS,
+                             compiler_directives={'language_level' : "3"},
+                             nthreads=NTHREADS) if cythonize else EXTENSIONS,
 
 )